@@ -4,6 +4,9 @@ from app.factories import LoaderFactory, StoreManagerFactory
 from app.storage import BaseStoreManager
 from app.document_processor import DocumentProcessor
 
+loader_factory = LoaderFactory()
+store_manager_factory = StoreManagerFactory()
+
 
 class DocumentProcessorBuilder:
     """
@@ -13,6 +16,8 @@ class DocumentProcessorBuilder:
     It ensures that all required components are set before building the `DocumentProcessor`.
     """
 
+    __slots__ = ('loader', 'services', 'skip_existing_artefacts', '_store_manager')
+
     DEFAULT_STORE_MANAGER_USER = 'root'
     DEFAULT_STORE_MANAGER_PORT = '27017'
     DEFAULT_STORE_MANAGER_PASSWORD = 'password'
@@ -28,12 +33,33 @@ class DocumentProcessorBuilder:
             The loader instance or None if not set.
         services : list
             A list of service configurations to be used by the `DocumentProcessor`.
+        skip_existing_artefacts : bool
+            Whether services whose artefacts are already stored are skipped (default is True).
         store_manager : BaseStoreManager
-            The store manager instance, initialized with default settings.
+            The store manager instance. A default one is only created when no store manager is
+            set before it is first accessed.
         """
         self.loader = None
         self.services = []
-        self.store_manager = self._create_default_store_manager()
+        self.skip_existing_artefacts = True
+        self._store_manager = None
+
+    @property
+    def store_manager(self) -> BaseStoreManager:
+        """
+        Retrieves the configured store manager, creating the default one if none was set.
+
+        The default store manager is created lazily to avoid opening a database connection
+        that is never used when the caller provides its own store manager.
+
+        Returns
+        -------
+        BaseStoreManager
+            The store manager to be used by the `DocumentProcessor`.
+        """
+        if self._store_manager is None:
+            self._store_manager = self._create_default_store_manager()
+        return self._store_manager
 
     def build(self):
         """
@@ -62,12 +88,14 @@ class DocumentProcessorBuilder:
         Returns
         -------
         dict
-            A dictionary containing the loader, store manager, and services.
+            A dictionary containing the loader, store manager, services, and whether existing
+            artefacts are skipped.
         """
         return {
             'loader': self.loader,
             'store_manager': self.store_manager,
             'services': self.services,
+            'skip_existing_artefacts': self.skip_existing_artefacts,
         }
 
     def set_services(self, services):
@@ -87,6 +115,23 @@ class DocumentProcessorBuilder:
         self.services = services
         return self
 
+    def set_skip_existing_artefacts(self, skip_existing_artefacts: bool):
+        """
+        Configures whether services whose artefacts are already stored are skipped.
+
+        Parameters
+        ----------
+        skip_existing_artefacts : bool
+            Whether to skip the services whose artefacts are already stored for the document.
+
+        Returns
+        -------
+        DocumentProcessorBuilder
+            The current builder instance for method chaining.
+        """
+        self.skip_existing_artefacts = skip_existing_artefacts
+        return self
+
     def set_loader(self, file_type: str = None, file_path: str = None, loader: 'BaseLoader' = None):
         """
         Sets the loader instance or creates one using the `LoaderFactory`.
@@ -107,7 +152,7 @@ class DocumentProcessorBuilder:
         """
         self.loader = (
             loader if loader is not None
-            else LoaderFactory().create(file_type=file_type, file_path=file_path)
+            else loader_factory.create(file_type=file_type, file_path=file_path)
         )
         return self
 
@@ -127,9 +172,9 @@ class DocumentProcessorBuilder:
         DocumentProcessorBuilder
             The current builder instance for method chaining.
         """
-        self.store_manager = (
+        self._store_manager = (
             store_manager if isinstance(store_manager, BaseStoreManager)
-            else StoreManagerFactory().create(store_manager=store_manager, **kwargs)
+            else store_manager_factory.create(store_manager=store_manager, **kwargs)
         )
         return self
 
@@ -142,7 +187,7 @@ class DocumentProcessorBuilder:
         BaseStoreManager
             The default store manager instance.
         """
-        return StoreManagerFactory().create(
+        return store_manager_factory.create(
             store_manager=self.DEFAULT_STORE_MANAGER_SERVICE,
             user=self.DEFAULT_STORE_MANAGER_USER,
             password=self.DEFAULT_STORE_MANAGER_PASSWORD,
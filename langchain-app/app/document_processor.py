@@ -1,13 +1,24 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator, Sequence
+from functools import cached_property
+
 from langchain_core.document_loaders import BaseLoader
 from langchain_core.documents.base import Document
-from langchain_core.messages.ai import AIMessage
+from langchain_core.messages.ai import AIMessage, AIMessageChunk
 
 from app.logger import global_logger
-from app.services.base import BaseService
+from app.models import ArtefactData
+from app.services.base import BaseService, join_page_contents
 from app.storage.base_store_manager import BaseStoreManager
 from app.storage.file_hasher import FileHasher
 
 
+def elapsed_ms(start: float) -> float:
+    """Milliseconds elapsed since `start`, a value previously returned by `time.perf_counter`."""
+    return round((time.perf_counter() - start) * 1000, 3)
+
+
 class DocumentProcessor:
     """
     A class for processing documents through a sequence of services.
@@ -23,17 +34,24 @@ class DocumentProcessor:
         The storage manager for saving and retrieving document-related data.
     services : list[BaseService]
         A list of services to apply to the document.
+    skip_existing_artefacts : bool
+        Whether services whose artefacts are already stored for the document, with the same
+        parameters, are skipped.
     hasher : FileHasher
-        Utility for generating a hash to uniquely identify the document.
+        Utility for generating a hash to uniquely identify the document, shared by every
+        processor since it holds no per-document state.
     logger : Any
         A logger instance for tracking the processing and service execution.
     """
 
+    hasher = FileHasher()
+
     def __init__(
         self,
         loader: BaseLoader,
         store_manager: BaseStoreManager,
         services: list[BaseService] = None,
+        skip_existing_artefacts: bool = True,
     ) -> None:
         """
         Initializes the `DocumentProcessor` with its loader, store manager, and services.
@@ -46,11 +64,21 @@ class DocumentProcessor:
             The storage manager for managing document data.
         services : list[BaseService], optional
             A list of services to apply to the document (default is None).
+        skip_existing_artefacts : bool, optional
+            Whether to skip the services whose artefacts are already stored for the document
+            with the same parameters (default is True). Documents are identified by their
+            content, so stored artefacts remain valid for every upload of the same document,
+            as long as the services are configured the same way (e.g., same target language).
         """
         self.loader = loader
         self.store_manager = store_manager
         self.services = services or []
-        self.hasher = FileHasher()
+        self.skip_existing_artefacts = skip_existing_artefacts
+        self._file_path = (
+            loader.blob_loader.path if hasattr(loader, 'blob_parser') else loader.file_path
+        )
+        self._file_content = None
+        self._file_content_lock = asyncio.Lock()
         self.logger = global_logger.bind(_id=self.file_hash, number_of_services=len(self.services))
 
     @property
@@ -58,31 +86,50 @@ class DocumentProcessor:
         """
         Retrieves the file path of the document.
 
+        The path is resolved from the loader once, when the processor is initialized, since
+        the loader does not change during the processor's lifetime.
+
         Returns
         -------
         str
             The file path of the document.
         """
-        has_blob_parser = hasattr(self.loader, 'blob_parser')
-        return self.loader.blob_loader.path if has_blob_parser else self.loader.file_path
+        return self._file_path
 
-    @property
+    @cached_property
     def file_hash(self) -> str:
         """
         Generates a hash for the document based on its content.
 
+        The hash is computed once per processor and reused by every service. Only the
+        sampled regions of the file are read to compute it.
+
         Returns
         -------
         str
             A SHA-256 hash representing the document's content.
         """
-        return self.hasher.hash(file_bytes=self.file_as_bytes)
+        return self.hasher.hash_path(file_path=self.file_path)
 
-    @property
-    def file_as_bytes(self) -> bytes:
+    async def read_file_bytes(self) -> bytes:
         """
         Reads the document content as bytes.
 
+        The file is read in a worker thread, so the event loop is not blocked while reading
+        large documents. The content is not kept by the processor, so it can be released as
+        soon as it is stored instead of being held while the services are executed.
+
+        Returns
+        -------
+        bytes
+            The binary content of the document.
+        """
+        return await asyncio.to_thread(self._read_file_bytes)
+
+    def _read_file_bytes(self) -> bytes:
+        """
+        Reads the document content as bytes from the file system.
+
         Returns
         -------
         bytes
@@ -91,22 +138,67 @@ class DocumentProcessor:
         with open(self.file_path, 'rb') as file:
             return file.read()
 
-    @property
-    def file_content(self) -> list[Document]:
+    async def load_file_content(self) -> list[Document]:
         """
         Loads the document content using the configured loader.
 
+        Loading (and parsing) the document is usually the most expensive CPU-bound step of the
+        pipeline, so it runs in a worker thread and only once per processor. A lock guards the
+        loader so that concurrent callers wait for the first load instead of starting another.
+
+        The pages extracted by the loader are merged into a single `Document` in the same worker
+        thread, so that services sharing the content do not join the pages again on every run.
+
+        Returns
+        -------
+        list[Document]
+            A list with a single `Document` containing the text extracted from the file.
+        """
+        async with self._file_content_lock:
+            if self._file_content is None:
+                self._file_content = await asyncio.to_thread(self._load_file_content)
+        return self._file_content
+
+    def _load_file_content(self) -> list[Document]:
+        """
+        Loads the document content with the configured loader and merges its pages.
+
         Returns
         -------
         list[Document]
-            A list of `Document` objects extracted from the file.
+            A list with a single `Document` containing the text extracted from the file.
+        """
+        pages = self.loader.load()
+        return [Document(page_content=join_page_contents(content=pages))]
+
+    async def store_document(self) -> str:
         """
-        return self.loader.load()
+        Stores the original document with the storage manager, unless it is already stored.
+
+        Returns
+        -------
+        str
+            The ID of the stored document.
+        """
+        return await self.store_manager.ensure_document_stored(
+            _id=self.file_hash,
+            document=await self.read_file_bytes(),
+        )
 
     async def execute_services(self) -> dict:
         """
         Executes all configured services on the document and stores their outputs.
 
+        Services are independent from each other and bound by the latency of the chat model
+        endpoint, so they are scheduled concurrently over the same loaded content, which is
+        shared (not copied) between them. If any service fails, the remaining ones are cancelled
+        and waited for, as an `asyncio.TaskGroup` would, before the error is propagated. Their
+        outputs are then stored in a single call to the storage manager. Storing the original
+        document overlaps with loading its content, as neither depends on the other. Unless
+        `skip_existing_artefacts` is False, services whose artefacts are already stored for the
+        document with the same parameters are not executed again, and the document is not even
+        loaded when all of them are.
+
         Returns
         -------
         dict
@@ -115,24 +207,235 @@ class DocumentProcessor:
         Notes
         -----
         This method logs the progress of each service execution and stores
-        the generated data in the storage manager.
+        the generated data in the storage manager. Progress messages are logged at debug level,
+        while a single event with the duration of each phase is logged at the end.
+        """
+        async for _ in self.iter_service_outputs():
+            pass
+        return await self.store_manager.get_document_by_id(_id=self.file_hash)
+
+    async def iter_service_outputs(
+        self,
+        include_stored: bool = False,
+    ) -> AsyncIterator[tuple[str, ArtefactData]]:
         """
-        self.logger.info("Starting sequence of services on document")
-        self.logger.info("Loading content from file", file_path=self.file_path)
-        file_content = self.file_content
+        Executes all configured services on the document, yielding their outputs as they finish.
+
+        Services are executed as described in `execute_services`, and their outputs are stored
+        once all of them have finished. If the iteration is not completed, the services still
+        running are cancelled and no output is stored.
+
+        Parameters
+        ----------
+        include_stored : bool, optional
+            Whether to also yield, before any other output, the stored outputs of the services
+            that are skipped because their artefacts already exist (default is False).
+
+        Yields
+        ------
+        tuple[str, ArtefactData]
+            The service type and the artefact data of each service, in order of completion.
+        """
+        self.logger.debug("Starting sequence of services on document")
+        services = await self.get_pending_services()
+        if include_stored and len(services) < len(self.services):
+            document = await self.store_manager.get_document_by_id(_id=self.file_hash)
+            for service in self.services:
+                if service not in services:
+                    yield service.service_type, document[service.service_type]
+
+        if not services:
+            self.logger.info(
+                "All artefacts already stored for document, skipping services",
+                number_of_skipped_services=len(self.services),
+            )
+            return
 
-        for i, service in enumerate(self.services):
-            service_logger = self.logger.bind(
-                service_type=service.service_type,
+        start = time.perf_counter()
+        file_content = await self._load_and_store_document()
+        load_ms = elapsed_ms(start)
+
+        start = time.perf_counter()
+        tasks = {
+            asyncio.create_task(self._execute_service(
+                service=service,
+                content=file_content,
                 service_number=i + 1,
+            )): service
+            for i, service in enumerate(services)
+        }
+        outputs = {}
+        try:
+            pending = tasks.keys()
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    service_type = tasks[task].service_type
+                    outputs[service_type] = task.result()
+                    yield service_type, outputs[service_type]
+        finally:
+            # only has effect if a service failed or the iteration was not completed, in which
+            # case the services still running are cancelled and waited for before the error (or
+            # the closing of the iteration) is propagated, so none of them outlives the call
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        services_ms = elapsed_ms(start)
+
+        self.logger.debug(
+            "Storing artefacts to database",
+            number_of_artefacts=len(outputs),
+            **self.store_manager.get_logging_information()
+        )
+        start = time.perf_counter()
+        await self.store_manager.store_service_outputs(
+            _id=self.file_hash,
+            outputs=outputs,
+            overwrite_existing=True,
+        )
+        store_ms = elapsed_ms(start)
+
+        self.logger.info(
+            "Finished sequence of services on document",
+            file_path=self.file_path,
+            number_of_skipped_services=len(self.services) - len(services),
+            load_ms=load_ms,
+            services_ms=services_ms,
+            store_ms=store_ms,
+            **self.store_manager.get_logging_information()
+        )
+
+    async def stream_service(self, service: BaseService) -> AsyncIterator[AIMessageChunk]:
+        """
+        Executes a single service on the document, yielding its output as it is generated.
+
+        The output is stored once the service finishes. If the iteration is not completed, the
+        generation is interrupted and nothing is stored. Unless `skip_existing_artefacts` is
+        False, a stored output of the service is yielded as a single chunk instead.
+
+        Parameters
+        ----------
+        service : BaseService
+            The service to execute.
+
+        Yields
+        ------
+        AIMessageChunk
+            The chunks of the output generated by the service.
+        """
+        if self.skip_existing_artefacts:
+            existing_artefact_hashes = await self.store_manager.get_existing_artefact_hashes(
+                _id=self.file_hash,
+                artefact_types=[service.service_type],
             )
+            if existing_artefact_hashes.get(service.service_type) == service.parameters_hash:
+                document = await self.store_manager.get_document_by_id(_id=self.file_hash)
+                artefact_data = document[service.service_type]
+                yield AIMessageChunk(id=artefact_data['_id'], content=artefact_data['content'])
+                return
 
-            service.set_logger(service_logger)
-            await self._execute_service_on_content(service=service, content=file_content)
+        file_content = await self._load_and_store_document()
+        service.set_logger(self.logger.bind(service_type=service.service_type, service_number=1))
+        logging_information = service.get_logging_information()
 
-        return self.store_manager.get_document_by_id(_id=self.file_hash)
+        start = time.perf_counter()
+        generated = None
+        async for chunk in service.stream(content=file_content):
+            generated = chunk if generated is None else generated + chunk
+            yield chunk
+        service.logger.info(
+            "Finished service execution",
+            generated_id=generated.id,
+            llm_ms=elapsed_ms(start),
+            **logging_information
+        )
 
-    async def _execute_service_on_content(self, service: BaseService, content: list[Document]):
+        await self.store_manager.store_service_outputs(
+            _id=self.file_hash,
+            outputs={service.service_type: self._build_artefact_data(service, generated)},
+            overwrite_existing=True,
+        )
+
+    async def get_pending_services(self) -> list[BaseService]:
+        """
+        Retrieves the services that still have to be executed on the document.
+
+        Stored artefacts generated with other parameters (e.g., another target language) do not
+        count, and are replaced once the services are executed again.
+
+        Returns
+        -------
+        list[BaseService]
+            The configured services, excluding those whose artefacts are already stored for the
+            document with the same parameters when `skip_existing_artefacts` is True.
+        """
+        if not self.skip_existing_artefacts:
+            return self.services
+
+        existing_artefact_hashes = await self.store_manager.get_existing_artefact_hashes(
+            _id=self.file_hash,
+            artefact_types=[service.service_type for service in self.services],
+        )
+        return [
+            service for service in self.services
+            if existing_artefact_hashes.get(service.service_type) != service.parameters_hash
+        ]
+
+    async def _load_and_store_document(self) -> list[Document]:
+        """
+        Loads the document content while the original document is stored, as neither depends
+        on the other.
+
+        Returns
+        -------
+        list[Document]
+            The loaded document content.
+        """
+        self.logger.debug(
+            "Loading content from file and storing document to database",
+            file_path=self.file_path,
+            **self.store_manager.get_logging_information()
+        )
+        async with asyncio.TaskGroup() as task_group:
+            load_task = task_group.create_task(self.load_file_content())
+            task_group.create_task(self.store_document())
+        return load_task.result()
+
+    async def _execute_service(
+        self,
+        service: BaseService,
+        content: Sequence[Document],
+        service_number: int,
+    ) -> ArtefactData:
+        """
+        Binds a service-specific logger to the service and executes it on the document content.
+
+        Parameters
+        ----------
+        service : BaseService
+            The service to execute.
+        content : Sequence[Document]
+            The `Document` objects to process, shared between services and treated as read-only.
+        service_number : int
+            The position of the service in the sequence of services (starting at 1).
+
+        Returns
+        -------
+        ArtefactData
+            The artefact data generated by the service.
+        """
+        service_logger = self.logger.bind(
+            service_type=service.service_type,
+            service_number=service_number,
+        )
+        service.set_logger(service_logger)
+        return await self._execute_service_on_content(service=service, content=content)
+
+    async def _execute_service_on_content(
+        self,
+        service: BaseService,
+        content: Sequence[Document],
+    ) -> ArtefactData:
         """
         Executes a single service on the document content.
 
@@ -140,41 +443,58 @@ class DocumentProcessor:
         ----------
         service : BaseService
             The service to execute.
-        content : list[Document]
-            A list of `Document` objects to process.
+        content : Sequence[Document]
+            The `Document` objects to process, shared between services and treated as read-only.
+
+        Returns
+        -------
+        ArtefactData
+            The artefact data to be stored for the service, containing the generation ID,
+            metadata, generated content and an empty list of feedback.
 
         Notes
         -----
-        This method logs the execution progress and stores the generated outputs
-        in the storage manager.
+        This method logs a single event once the service finishes, including the time spent
+        on the LLM generation. Storing the generated outputs is left to the caller so that the
+        outputs of all services can be stored at once.
         """
-        service.logger.info(
+        logging_information = service.get_logging_information()
+        service.logger.debug(
             "Starting service execution over the loaded content",
-            **service.get_logging_information()
+            **logging_information
         )
 
+        start = time.perf_counter()
         generated: AIMessage = await service.run(content=content)
         service.logger.info(
-            "Finished service LLM generation",
+            "Finished service execution",
             generated_id=generated.id,
-            **service.get_logging_information()
+            llm_ms=elapsed_ms(start),
+            **logging_information
         )
+        return self._build_artefact_data(service=service, generated=generated)
 
-        artefact_data = {
-            '_id': generated.id,
-            'metadata': service.get_metadata(file=self.file_path, gen_metadata=generated),
-            'content': generated.content,
-            'feedback': [],
-        }
+    def _build_artefact_data(self, service: BaseService, generated: AIMessage) -> ArtefactData:
+        """
+        Builds the artefact data to be stored for the output generated by a service.
 
-        service.logger.info(
-            "Storing artefacts to database",
-            **self.store_manager.get_logging_information()
-        )
-        await self.store_manager.store_service_output(
-            _id=self.file_hash,
-            artefact=service.service_type,
-            data=artefact_data,
-            document=self.file_as_bytes,
-            overwrite_existing=True,
+        Parameters
+        ----------
+        service : BaseService
+            The service that generated the output.
+        generated : AIMessage
+            The output generated by the service.
+
+        Returns
+        -------
+        ArtefactData
+            The artefact data containing the generation ID, the hash of the service parameters,
+            metadata, generated content and an empty list of feedback.
+        """
+        return ArtefactData(
+            _id=generated.id,
+            parameters_hash=service.parameters_hash,
+            metadata=service.get_metadata(file=self.file_path, gen_metadata=generated),
+            content=generated.content,
+            feedback=[],
         )
@@ -1,7 +1,44 @@
-from redis import Redis
+from functools import cache
+from types import MappingProxyType
+
+from redis import ConnectionPool, Redis
 
 from langchain_core.caches import BaseCache
-from langchain_community.cache import RedisCache
+from langchain_community.cache import RedisCache, SQLiteCache
+
+from app.factories.instance_cache import InstanceCache
+
+
+REDIS_MAX_CONNECTIONS = 100
+DEFAULT_CACHE_TTL_IN_SECONDS = 7 * 24 * 60 * 60  # one week
+
+
+@cache
+def get_redis_connection_pool(host: str, port: int, decode_responses: bool) -> ConnectionPool:
+    """
+    Retrieves the process-wide Redis connection pool for the given server.
+
+    Parameters
+    ----------
+    host : str
+        The Redis server hostname.
+    port : int
+        The Redis server port.
+    decode_responses : bool
+        Whether to decode responses from Redis.
+
+    Returns
+    -------
+    ConnectionPool
+        The connection pool shared by every Redis client connecting to the same server, bounded
+        to `REDIS_MAX_CONNECTIONS` connections.
+    """
+    return ConnectionPool(
+        host=host,
+        port=port,
+        decode_responses=decode_responses,
+        max_connections=REDIS_MAX_CONNECTIONS,
+    )
 
 
 class CacheFactory:
@@ -12,12 +49,19 @@ class CacheFactory:
     ----------
     available_caches : dict
         A dictionary mapping cache types (str) to their respective factory methods.
+
+    Caches created with the same parameters are shared across all factory instances.
     """
 
+    __slots__ = ('available_caches',)
+
+    _instance_cache = InstanceCache()
+
     def __init__(self):
-        self.available_caches = {
+        self.available_caches = MappingProxyType({
             'redis': self._get_redis_cache,
-        }
+            'sqlite': self._get_sqlite_cache,
+        })
 
     def create(self, cache: str, **kwargs) -> BaseCache:
         """
@@ -26,7 +70,7 @@ class CacheFactory:
         Parameters
         ----------
         cache : str
-            The cache type to create (e.g., 'redis').
+            The cache type to create (e.g., 'redis', 'sqlite').
         **kwargs : dict
             Additional keyword arguments passed to the cache factory method.
 
@@ -50,18 +94,22 @@ class CacheFactory:
                 f"Invalid cache type '{cache}'. "
                 f"Valid cache types are: {self.get_valid_cache_types()}"
             )
-        return self.available_caches[cache](**kwargs)
+        return self._instance_cache.get_or_create(cache, self.available_caches[cache], **kwargs)
 
     def _get_redis_cache(
         self,
         host: str = 'redis',
         port: int = 6379,
         decode_responses: bool = True,
+        ttl: int | None = DEFAULT_CACHE_TTL_IN_SECONDS,
         **kwargs
     ) -> RedisCache:
         """
         Creates a Redis cache instance.
 
+        The underlying Redis client uses the connection pool shared by all clients connecting
+        to the same server.
+
         Parameters
         ----------
         host : str
@@ -70,6 +118,9 @@ class CacheFactory:
             The Redis server port.
         decode_responses : bool, optional
             Whether to decode responses from Redis (default is True).
+        ttl : int or None, optional
+            Time to live of the cached generations in seconds, or None for no expiration
+            (default is `DEFAULT_CACHE_TTL_IN_SECONDS`).
         **kwargs : dict
             Additional keyword arguments for configuring the Redis cache.
 
@@ -79,10 +130,38 @@ class CacheFactory:
             A RedisCache instance.
         """
         return RedisCache(
-            redis_=Redis(host=host, port=port, decode_responses=decode_responses),
+            redis_=Redis(
+                connection_pool=get_redis_connection_pool(
+                    host=host,
+                    port=port,
+                    decode_responses=decode_responses,
+                ),
+            ),
+            ttl=ttl,
             **kwargs,
         )
 
+    def _get_sqlite_cache(self, database_path: str = '.langchain.db', **kwargs) -> SQLiteCache:
+        """
+        Creates a SQLite cache instance.
+
+        The SQLite cache persists generations on the local disk, so it does not depend on a Redis
+        server, but it is not shared between hosts.
+
+        Parameters
+        ----------
+        database_path : str, optional
+            The path of the SQLite database file (default is '.langchain.db').
+        **kwargs : dict
+            Additional keyword arguments for configuring the SQLite cache.
+
+        Returns
+        -------
+        SQLiteCache
+            A SQLiteCache instance.
+        """
+        return SQLiteCache(database_path=database_path, **kwargs)
+
     def get_valid_cache_types(self) -> list[str]:
         """
         Get a list of valid cache types that can be created.
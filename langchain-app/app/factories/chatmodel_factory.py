@@ -1,8 +1,37 @@
+from types import MappingProxyType
+
+import httpx
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_google_vertexai import ChatVertexAI
 from langchain_ollama import ChatOllama
 
+from app.factories.instance_cache import InstanceCache
+
+# HTTP client settings shared by the Ollama chat models: generations can take minutes, so only
+# connecting is time-limited, and the pool is large enough for concurrent services and requests
+OLLAMA_CLIENT_KWARGS = MappingProxyType({
+    'limits': httpx.Limits(max_connections=128, max_keepalive_connections=64),
+    'timeout': httpx.Timeout(None, connect=5.0),
+})
+
+
+def create_ollama_chatmodel(**kwargs) -> ChatOllama:
+    """
+    Creates an Ollama chat model whose HTTP clients use `OLLAMA_CLIENT_KWARGS`.
+
+    Parameters
+    ----------
+    **kwargs : dict
+        Keyword arguments passed to `ChatOllama`.
+
+    Returns
+    -------
+    ChatOllama
+        The Ollama chat model.
+    """
+    return ChatOllama(client_kwargs=dict(OLLAMA_CLIENT_KWARGS), **kwargs)
+
 
 class ChatModelFactory:
     """
@@ -11,15 +40,22 @@ class ChatModelFactory:
     Attributes
     ----------
     available_chatmodel_services : dict
-        A dictionary mapping chat model service names (str) to their respective classes.
+        A dictionary mapping chat model service names (str) to their respective classes (or
+        functions creating them).
+
+    Chat models created with the same parameters are shared across all factory instances, so
+    their HTTP clients are reused instead of being created on every call.
     """
 
-    def __init__(self) -> None:
-        self.available_chatmodel_services = {
-            'google-genai': ChatGoogleGenerativeAI,
-            'google-vertex': ChatVertexAI,
-            'ollama': ChatOllama,
-        }
+    __slots__ = ()
+
+    _instance_cache = InstanceCache()
+
+    available_chatmodel_services = MappingProxyType({
+        'google-genai': ChatGoogleGenerativeAI,
+        'google-vertex': ChatVertexAI,
+        'ollama': create_ollama_chatmodel,
+    })
 
     def create(self, service: str, **kwargs) -> BaseChatModel:
         """
@@ -50,9 +86,13 @@ class ChatModelFactory:
         if service not in self.available_chatmodel_services:
             raise ValueError(
                 f"Invalid chat model '{service}'. "
-                f"Valid chat models are: {self.get_valid_chat_models()}"
+                f"Valid chat models are: {self.get_valid_chatmodel_services()}"
             )
-        return self.available_chatmodel_services[service](**kwargs)
+        return self._instance_cache.get_or_create(
+            service,
+            self.available_chatmodel_services[service],
+            **kwargs,
+        )
 
     def get_valid_chatmodel_services(self) -> list[str]:
         """
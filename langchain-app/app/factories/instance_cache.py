@@ -0,0 +1,45 @@
+from typing import Any, Callable, Hashable
+
+
+class InstanceCache:
+    """
+    A registry of instances created by factories, keyed by their creation parameters.
+
+    Factories producing clients that hold network connections (chat models, caches, store
+    managers) use this registry so that repeated calls with the same parameters share the same
+    instance, and thus the same underlying connection pools, instead of creating new ones.
+    """
+
+    __slots__ = ('_instances',)
+
+    def __init__(self) -> None:
+        self._instances: dict[Hashable, Any] = {}
+
+    def get_or_create(self, name: str, creator: Callable[..., Any], **kwargs) -> Any:
+        """
+        Retrieves the instance created for `name` and `kwargs`, creating it if needed.
+
+        Parameters
+        ----------
+        name : str
+            The name of the instance type to create (e.g., 'ollama', 'redis').
+        creator : Callable[..., Any]
+            The callable used to create the instance when it is not cached yet.
+        **kwargs : dict
+            Keyword arguments passed to `creator`.
+
+        Returns
+        -------
+        Any
+            The cached or newly created instance. Instances created with unhashable keyword
+            arguments are never cached.
+        """
+        try:
+            key = (name, frozenset(kwargs.items()))
+            hash(key)
+        except TypeError:
+            return creator(**kwargs)
+
+        if key not in self._instances:
+            self._instances[key] = creator(**kwargs)
+        return self._instances[key]
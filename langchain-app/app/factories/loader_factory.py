@@ -1,3 +1,5 @@
+from types import MappingProxyType
+
 from langchain_core.document_loaders import BaseLoader
 from langchain_community.document_loaders import PyMuPDFLoader
 from langchain_community.document_loaders.generic import GenericLoader
@@ -14,11 +16,13 @@ class LoaderFactory:
         A dictionary mapping MIME types (str) to their respective loader factory methods.
     """
 
+    __slots__ = ('loader_from_mime_type',)
+
     def __init__(self):
-        self.loader_from_mime_type = {
+        self.loader_from_mime_type = MappingProxyType({
             'application/pdf': self._get_pdf_loader,
             'video/mp4': self._get_audio_loader,
-        }
+        })
 
     def create(self, file_type: str, file_path: str, **kwargs) -> BaseLoader:
         """
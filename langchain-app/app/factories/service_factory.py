@@ -1,3 +1,5 @@
+from types import MappingProxyType
+
 from app.services import Summarizer, ServiceTypes, Descriptor, Tagger, Translator, MinimalService
 
 
@@ -9,12 +11,14 @@ class ServiceFactory:
     the customization of services through additional configurations.
     """
 
-    MINIMAL_SERVICES = {
+    __slots__ = ()
+
+    MINIMAL_SERVICES = MappingProxyType({
         ServiceTypes.SUMMARIZATION: Summarizer,
         ServiceTypes.DESCRIPTION: Descriptor,
         ServiceTypes.TAGGING: Tagger,
         ServiceTypes.TRANSLATION: Translator,
-    }
+    })
 
     def create_minimal_service(self, service: str, **kwargs) -> MinimalService:
         """
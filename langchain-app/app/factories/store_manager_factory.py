@@ -1,3 +1,6 @@
+from types import MappingProxyType
+
+from app.factories.instance_cache import InstanceCache
 from app.storage.mongodb import MongoDBStoreManager
 
 
@@ -9,12 +12,18 @@ class StoreManagerFactory:
     ----------
     store_managers : dict
         A dictionary mapping store manager names (str) to their respective classes.
+
+    Store managers created with the same parameters are shared across all factory instances,
+    so their database clients (and connection pools) are reused.
     """
 
-    def __init__(self):
-        self.store_managers = {
-            'mongodb': MongoDBStoreManager,
-        }
+    __slots__ = ()
+
+    _instance_cache = InstanceCache()
+
+    store_managers = MappingProxyType({
+        'mongodb': MongoDBStoreManager,
+    })
 
     def create(self, store_manager: str, **kwargs):
         """
@@ -47,7 +56,11 @@ class StoreManagerFactory:
                 f"Invalid store manager '{store_manager}'. "
                 f"Valid store managers are: {self.get_valid_store_managers()}"
             )
-        return self.store_managers[store_manager](**kwargs)
+        return self._instance_cache.get_or_create(
+            store_manager,
+            self.store_managers[store_manager],
+            **kwargs,
+        )
 
     def get_valid_store_managers(self) -> list[str]:
         """
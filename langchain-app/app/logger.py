@@ -1,14 +1,33 @@
+import atexit
 import logging
+import logging.handlers
+import queue
 
+import orjson
 import structlog
 
 
+def _orjson_dumps(value, **kwargs) -> str:
+    """Serializes log events with `orjson`, returning `str` as expected by stdlib handlers."""
+    return orjson.dumps(value, **kwargs).decode()
+
+
+# log records are handed to a queue and written to the actual sinks by a background thread,
+# so that emitting a log event never blocks the event loop on file I/O
+log_queue = queue.SimpleQueue()
+log_listener = logging.handlers.QueueListener(
+    log_queue,
+    logging.StreamHandler(),
+    logging.FileHandler("application.log"),
+)
+log_listener.start()
+atexit.register(log_listener.stop)
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(message)s",
     handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler("application.log")
+        logging.handlers.QueueHandler(log_queue),
     ]
 )
 
@@ -16,7 +35,7 @@ structlog.configure(
     processors=[
         structlog.processors.TimeStamper(fmt="iso"),
         structlog.processors.add_log_level,
-        structlog.processors.JSONRenderer(),
+        structlog.processors.JSONRenderer(serializer=_orjson_dumps),
     ],
     context_class=dict,
     wrapper_class=structlog.stdlib.BoundLogger,
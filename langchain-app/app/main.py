@@ -1,9 +1,21 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
 from app.routers.process import router as processing_router
-from app.routers.feedback import router as feedback_router
+from app.routers.feedback import get_feedback_buffer, router as feedback_router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    feedback_buffer = get_feedback_buffer()
+    feedback_buffer.start()
+    yield
+    await feedback_buffer.stop()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 app.include_router(processing_router)
 app.include_router(feedback_router)
@@ -1,7 +1,10 @@
+from app.models.artefact_data import ArtefactData
 from app.models.feedback_form import FeedbackForm
-from app.models.structured_extraction_templates import DocumentInfo
+from app.models.structured_extraction_templates import DocumentInfo, SummarizationBundle
 
 __all__ = [
+    'ArtefactData',
     'FeedbackForm',
     'DocumentInfo',
+    'SummarizationBundle',
 ]
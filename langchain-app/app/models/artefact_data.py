@@ -0,0 +1,10 @@
+from typing import Any, TypedDict
+
+
+class ArtefactData(TypedDict):
+    """Artefact generated by a service over a document, as stored by the store managers."""
+    _id: str
+    parameters_hash: str
+    metadata: dict[str, Any]
+    content: str
+    feedback: list[dict[str, Any]]
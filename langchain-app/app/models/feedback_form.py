@@ -1,9 +1,14 @@
+from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class FeedbackForm(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='ignore', str_strip_whitespace=True)
+
     user: str
     feedback: Optional[str] = None
     written_feedback: Optional[str] = None
+    # set when the feedback is received, unless provided by the client
+    created_at: Optional[datetime] = None
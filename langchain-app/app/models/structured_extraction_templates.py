@@ -39,3 +39,13 @@ class DocumentInfo(BaseModel):
         paper, key results in a financial report)
         """
     )
+
+
+class SummarizationBundle(BaseModel):
+    """Document information and summary generated together in a single structured output."""
+    document_info: DocumentInfo = Field(
+        description="General information about the document, used to guide the summary."
+    )
+    summary: str = Field(
+        description="The summary of the document, guided by the extracted document information."
+    )
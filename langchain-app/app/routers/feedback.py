@@ -1,30 +1,117 @@
 import os
+from functools import cache
+from typing import Annotated
 
-
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import TypeAdapter, ValidationError
 
 from app.factories import StoreManagerFactory
 from app.models import FeedbackForm
+from app.storage import BaseStoreManager, FeedbackBuffer
 
 
 router = APIRouter(tags=['Feedback'])
+store_manager_factory = StoreManagerFactory()
+feedback_form_adapter = TypeAdapter(FeedbackForm)
+
+MONGO_PORT = '27017'
+# required, so a missing credential fails on startup instead of when connecting
+MONGO_USER = os.environ['MONGO_INITDB_ROOT_USERNAME']
+MONGO_PASSWORD = os.environ['MONGO_INITDB_ROOT_PASSWORD']
+# locked by the feedback buffer of the process, so servers running several worker processes
+# must give each of them its own path
+FEEDBACK_WAL_PATH = os.getenv('FEEDBACK_WAL_PATH', 'feedback.wal')
+
+
+@cache
+def get_store_manager() -> BaseStoreManager:
+    """
+    Retrieves the store manager shared by every feedback request.
+
+    Returns
+    -------
+    BaseStoreManager
+        The MongoDB store manager, created on first use, whose client pools its connections.
+    """
+    return store_manager_factory.create(
+        store_manager='mongodb',
+        port=MONGO_PORT,
+        password=MONGO_PASSWORD,
+        user=MONGO_USER,
+    )
+
+
+@cache
+def get_feedback_buffer() -> FeedbackBuffer:
+    """
+    Retrieves the buffer through which every feedback is stored.
+
+    Returns
+    -------
+    FeedbackBuffer
+        The feedback buffer, created on first use, storing feedbacks with the shared store manager
+        and logging them ahead to `FEEDBACK_WAL_PATH`.
+    """
+    return FeedbackBuffer(store_manager=get_store_manager(), wal_path=FEEDBACK_WAL_PATH)
 
 
-@router.post("/feedback")
+async def parse_feedback_form(request: Request) -> FeedbackForm:
+    """
+    Parses the feedback form from the raw request body.
+
+    The JSON body is validated directly by the pre-built validator of `FeedbackForm`, instead of
+    being decoded into a dict first and then validated.
+
+    Parameters
+    ----------
+    request : Request
+        The request whose body contains the feedback form.
+
+    Returns
+    -------
+    FeedbackForm
+        The validated feedback form.
+
+    Raises
+    ------
+    RequestValidationError
+        If the body is not a valid feedback form, so it is reported as any other invalid request.
+    """
+    try:
+        return feedback_form_adapter.validate_json(await request.body())
+    except ValidationError as error:
+        raise RequestValidationError(errors=error.errors(include_url=False)) from error
+
+
+@router.post(
+    "/feedback",
+    status_code=status.HTTP_202_ACCEPTED,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": feedback_form_adapter.json_schema()}},
+        },
+    },
+)
 async def process_feedback(
-    form: FeedbackForm,
+    form: Annotated[FeedbackForm, Depends(parse_feedback_form)],
+    store_manager: Annotated[BaseStoreManager, Depends(get_store_manager)],
+    feedback_buffer: Annotated[FeedbackBuffer, Depends(get_feedback_buffer)],
     _id: str = Query(..., description="Document ID."),
     service_type: str = Query(..., description='Service type for which the feedback is stored.'),
 ):
-    storage_manager = StoreManagerFactory().create(
-        store_manager='mongodb',
-        port='27017',
-        password=os.environ['MONGO_INITDB_ROOT_PASSWORD'],
-        user=os.environ['MONGO_INITDB_ROOT_USERNAME'],
-    )
-
-    return await storage_manager.store_service_output_feedback(
+    # feedbacks are stored in the background, so those for unknown artefacts are rejected here
+    # instead of being dropped when their batch is stored
+    existing_artefact_hashes = await store_manager.get_existing_artefact_hashes(
         _id=_id,
-        service_type=service_type,
-        form=form
+        artefact_types=[service_type],
     )
+    if service_type not in existing_artefact_hashes:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No {service_type} artefact stored for document {_id}",
+        )
+
+    await feedback_buffer.put(_id=_id, service_type=service_type, form=form)
+    return _id
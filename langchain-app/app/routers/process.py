@@ -1,103 +1,321 @@
 import os
-import json
+import asyncio
+from collections.abc import AsyncIterator
+from functools import cache
+from types import MappingProxyType
 from tempfile import NamedTemporaryFile
 
 import magic
+import orjson
 from fastapi import APIRouter, File, UploadFile, Response, Query
+from fastapi.responses import StreamingResponse
+from langchain_core.caches import BaseCache
+from sse_starlette.sse import EventSourceResponse
+from langchain_core.language_models.chat_models import BaseChatModel
 
 from app.services.base import BaseService
 from app.builders.document_processor import DocumentProcessorBuilder
+from app.document_processor import DocumentProcessor
 from app.factories import CacheFactory, ChatModelFactory, ServiceFactory
 from app.services.service_types import ServiceTypes
 
 router = APIRouter(tags=['Document Operations'])
 service_factory = ServiceFactory()
+chatmodel_factory = ChatModelFactory()
+cache_factory = CacheFactory()
+mime_detector = magic.Magic(mime=True)  # loads the libmagic database once per process
 
 OLLAMA_SERVER_URL = 'http://ollama-server:11434'
+# only exact caches (keyed by the rendered prompt and model parameters) are available, as
+# prompts differing only in their parameters (e.g., target language) must not share outputs
+LLM_CACHE_TYPE = os.getenv('LLM_CACHE_TYPE', 'redis')
+# directory where uploads are written for the loaders, e.g. a tmpfs such as /dev/shm to keep
+# them in memory (defaults to the system temporary directory)
+UPLOAD_TMP_DIR = os.getenv('UPLOAD_TMP_DIR')
+UPLOAD_CHUNK_SIZE_IN_BYTES = 1 << 20  # 1 MiB
+MIME_SNIFFING_SIZE_IN_BYTES = 4096  # libmagic only needs the first few KB of the file
+# ollama model tiers: narrow tasks with short outputs (e.g. tagging) run on the small model, and
+# tasks generating long outputs from the whole document run on the medium model; only the medium
+# model is provisioned by default, so a small model must be pulled in the ollama server before
+# being set with `SMALL_MODEL`, and the medium model is used otherwise
+MEDIUM_OLLAMA_MODEL = os.getenv('MEDIUM_MODEL', 'llama3.1')
+SMALL_OLLAMA_MODEL = os.getenv('SMALL_MODEL', MEDIUM_OLLAMA_MODEL)
+
+# chat model used by each service; parameters that only affect the prompt (e.g. `max_tokens`,
+# `target_language`) are passed to the services instead, so the chat models can be shared
+CHATMODEL_PARAMETERS = MappingProxyType({
+    ServiceTypes.SUMMARIZATION: {
+        'service': 'ollama',
+        'model': MEDIUM_OLLAMA_MODEL,
+        'base_url': OLLAMA_SERVER_URL,
+    },
+    ServiceTypes.DESCRIPTION: {'service': 'google-genai', 'model': 'gemini-1.5-flash'},
+    ServiceTypes.TAGGING: {
+        'service': 'ollama',
+        'model': SMALL_OLLAMA_MODEL,
+        'base_url': OLLAMA_SERVER_URL,
+    },
+    ServiceTypes.TRANSLATION: {
+        'service': 'ollama',
+        'model': MEDIUM_OLLAMA_MODEL,
+        'base_url': OLLAMA_SERVER_URL,
+    },
+})
+
+# chat model used by a service when its own chat model keeps failing, e.g. a local model taking
+# over when the remote provider is unavailable or rate limited
+FALLBACK_CHATMODEL_PARAMETERS = MappingProxyType({
+    ServiceTypes.DESCRIPTION: {
+        'service': 'ollama',
+        'model': SMALL_OLLAMA_MODEL,
+        'base_url': OLLAMA_SERVER_URL,
+    },
+})
+
+
+@cache
+def get_llm_cache() -> BaseCache:
+    """
+    Retrieves the LLM cache shared by every chat model created by this router.
+
+    Returns
+    -------
+    BaseCache
+        The cache of type `LLM_CACHE_TYPE` (the exact Redis cache by default, keyed by prompt and
+        model parameters), created on first use.
+    """
+    return cache_factory.create(cache=LLM_CACHE_TYPE)
+
+
+@cache
+def get_chatmodel(service_type: ServiceTypes) -> BaseChatModel:
+    """
+    Retrieves the chat model used by a service, shared by every request to that service.
+
+    Parameters
+    ----------
+    service_type : ServiceTypes
+        The type of the service the chat model is used by.
+
+    Returns
+    -------
+    BaseChatModel
+        The chat model configured in `CHATMODEL_PARAMETERS` for the service, created on first use
+        and backed by the shared LLM cache.
+    """
+    return chatmodel_factory.create(**CHATMODEL_PARAMETERS[service_type], cache=get_llm_cache())
+
+
+@cache
+def get_fallback_chatmodel(service_type: ServiceTypes) -> BaseChatModel | None:
+    """
+    Retrieves the fallback chat model of a service, shared by every request to that service.
+
+    Parameters
+    ----------
+    service_type : ServiceTypes
+        The type of the service the fallback chat model is used by.
+
+    Returns
+    -------
+    BaseChatModel | None
+        The chat model configured in `FALLBACK_CHATMODEL_PARAMETERS` for the service, created on
+        first use and backed by the shared LLM cache, or None if the service has no fallback.
+    """
+    if service_type not in FALLBACK_CHATMODEL_PARAMETERS:
+        return None
+    return chatmodel_factory.create(
+        **FALLBACK_CHATMODEL_PARAMETERS[service_type],
+        cache=get_llm_cache(),
+    )
 
 
 @router.post('/summarization')
 async def process_summarization(
+    text_percentage: int = Query(default=30, description="Length of the original text to keep (in percentage)"),
+    stream: bool = Query(default=False, description="Stream each service output as a NDJSON line as soon as it is generated."),
+    file: UploadFile = File(...)
+):
+    service = service_factory.create_minimal_service(
+        service=ServiceTypes.SUMMARIZATION,
+        chatmodel=get_chatmodel(ServiceTypes.SUMMARIZATION),
+        has_system_msg_support=False,
+        text_percentage=text_percentage,
+    )
+    return await invoke_service_set(file=file, services=[service], stream=stream)
+
+
+@router.post('/summarization/stream')
+async def stream_summarization(
     text_percentage: int = Query(default=30, description="Length of the original text to keep (in percentage)"),
     file: UploadFile = File(...)
 ):
     service = service_factory.create_minimal_service(
         service=ServiceTypes.SUMMARIZATION,
-        chatmodel=ChatModelFactory().create(
-            service='ollama',
-            model='llama3.1',
-            base_url=OLLAMA_SERVER_URL,
-        ),
+        chatmodel=get_chatmodel(ServiceTypes.SUMMARIZATION),
         has_system_msg_support=False,
         text_percentage=text_percentage,
     )
-    return await invoke_service_set(file=file, services=[service])
+    processor = await build_processor(services=[service], file=file)
+    return EventSourceResponse(stream_service_tokens(processor=processor, service=service))
 
 
 @router.post('/description')
 async def process_description(
     max_tokens: int = Query(default=85, description="Maximum number of tokens in the generated description."),
+    stream: bool = Query(default=False, description="Stream each service output as a NDJSON line as soon as it is generated."),
     file: UploadFile = File(...)
 ):
     service = service_factory.create_minimal_service(
         service=ServiceTypes.DESCRIPTION,
-        chatmodel=ChatModelFactory().create(
-            service='google-genai',
-            model='gemini-1.5-flash',
-            cache=CacheFactory().create(cache='redis'),
-        ),
+        chatmodel=get_chatmodel(ServiceTypes.DESCRIPTION),
+        fallback_chatmodel=get_fallback_chatmodel(ServiceTypes.DESCRIPTION),
         max_tokens=max_tokens,
     )
-    return await invoke_service_set(file=file, services=[service])
+    return await invoke_service_set(file=file, services=[service], stream=stream)
 
 
 @router.post('/tagging')
-async def process_tagging(file: UploadFile = File(...)):
+async def process_tagging(
+    stream: bool = Query(default=False, description="Stream each service output as a NDJSON line as soon as it is generated."),
+    file: UploadFile = File(...)
+):
     service = service_factory.create_minimal_service(
         service=ServiceTypes.TAGGING,
-        chatmodel=ChatModelFactory().create(
-            service='ollama',
-            model='llama3.1',
-            base_url=OLLAMA_SERVER_URL,
-        ),
+        chatmodel=get_chatmodel(ServiceTypes.TAGGING),
         has_system_msg_support=True,
     )
-    return await invoke_service_set(file=file, services=[service])
+    return await invoke_service_set(file=file, services=[service], stream=stream)
 
 
 @router.post('/translation')
 async def process_translation(
     target_language: str = Query(default='portugues', description="Target language for the translation"),
+    stream: bool = Query(default=False, description="Stream each service output as a NDJSON line as soon as it is generated."),
     file: UploadFile = File(...)
 ):
     service = service_factory.create_minimal_service(
         service=ServiceTypes.TRANSLATION,
-        chatmodel=ChatModelFactory().create(
-            service='ollama',
-            model='llama3.1',
-            base_url=OLLAMA_SERVER_URL,
-        ),
+        chatmodel=get_chatmodel(ServiceTypes.TRANSLATION),
         has_system_msg_support=True,
         target_language=target_language,
     )
-    return await invoke_service_set(file=file, services=[service])
+    return await invoke_service_set(file=file, services=[service], stream=stream)
+
+
+async def invoke_service_set(
+    services: list[BaseService],
+    file: UploadFile = File(...),
+    stream: bool = False,
+):
+    processor = await build_processor(services=services, file=file)
+    if stream:
+        return StreamingResponse(
+            content=stream_service_outputs(processor=processor),
+            media_type='application/x-ndjson',
+        )
 
+    service_responses = orjson.dumps(await processor.execute_services())
+    return Response(content=service_responses, media_type='application/json')
+
+
+async def build_processor(services: list[BaseService], file: UploadFile) -> DocumentProcessor:
+    """
+    Builds the processor executing a set of services on an uploaded file.
 
-async def invoke_service_set(services: list[BaseService], file: UploadFile = File(...)):
-    contents = await file.read()
+    Parameters
+    ----------
+    services : list[BaseService]
+        The services to be executed on the file.
+    file : UploadFile
+        The uploaded file, written to a temporary file read by the processor.
+
+    Returns
+    -------
+    DocumentProcessor
+        The processor executing the services on the file.
+    """
     filename = os.path.basename(file.filename)
 
-    with NamedTemporaryFile(suffix=f"_{filename}", delete=False) as tmp_file:
-        tmp_file.write(contents)
-        tmp_file.flush()
-        tmp_file.seek(0)  # Ensure the file pointer is at the start
+    with NamedTemporaryFile(suffix=f"_{filename}", dir=UPLOAD_TMP_DIR, delete=False) as tmp_file:
+        file_head = await write_upload_to_file(upload=file, file=tmp_file)
 
-        processor = (
+        return (
             DocumentProcessorBuilder()
-            .set_loader(file_type=magic.from_buffer(contents, mime=True), file_path=tmp_file.name)
+            .set_loader(file_type=mime_detector.from_buffer(file_head), file_path=tmp_file.name)
             .set_services(services)
             .build()
         )
 
-    service_responses = json.dumps(await processor.execute_services())
-    return Response(content=service_responses, media_type='application/json')
+
+async def stream_service_tokens(
+    processor: DocumentProcessor,
+    service: BaseService,
+) -> AsyncIterator[dict]:
+    """
+    Streams the output of a service as server-sent events, as the chat model generates it.
+
+    Parameters
+    ----------
+    processor : DocumentProcessor
+        The processor executing the service on the document.
+    service : BaseService
+        The service to be executed.
+
+    Yields
+    ------
+    dict
+        A server-sent event for each non-empty chunk of the output.
+    """
+    async for chunk in processor.stream_service(service=service):
+        if chunk.content:
+            yield {"data": chunk.content}
+
+
+async def stream_service_outputs(processor: DocumentProcessor) -> AsyncIterator[bytes]:
+    """
+    Serializes the output of each service as a NDJSON line, as soon as the service finishes.
+
+    Outputs already stored for the document are streamed first, so that every requested service
+    has a line in the response.
+
+    Parameters
+    ----------
+    processor : DocumentProcessor
+        The processor executing the services on the document.
+
+    Yields
+    ------
+    bytes
+        A JSON object mapping the service type to its artefact data, followed by a newline.
+    """
+    async for service_type, artefact_data in processor.iter_service_outputs(include_stored=True):
+        yield orjson.dumps({service_type: artefact_data}, option=orjson.OPT_APPEND_NEWLINE)
+
+
+async def write_upload_to_file(upload: UploadFile, file) -> bytes:
+    """
+    Writes the content of an uploaded file to a file object, one chunk at a time.
+
+    The upload is never fully loaded in memory, and writes run in a worker thread so that they do
+    not block the event loop.
+
+    Parameters
+    ----------
+    upload : UploadFile
+        The uploaded file to be written.
+    file : file object
+        The binary file object the upload is written to.
+
+    Returns
+    -------
+    bytes
+        The first `MIME_SNIFFING_SIZE_IN_BYTES` bytes of the upload, used to detect its type.
+    """
+    file_head = b''
+    while chunk := await upload.read(UPLOAD_CHUNK_SIZE_IN_BYTES):
+        if len(file_head) < MIME_SNIFFING_SIZE_IN_BYTES:
+            file_head += chunk[:MIME_SNIFFING_SIZE_IN_BYTES - len(file_head)]
+        await asyncio.to_thread(file.write, chunk)
+    await asyncio.to_thread(file.flush)
+    return file_head
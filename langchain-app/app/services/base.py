@@ -1,8 +1,194 @@
+import hashlib
+import math
 from typing import Any
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Sequence
+from functools import cached_property
 
+import httpx
+import orjson
+from google.api_core import exceptions as google_exceptions
 from langchain_core.documents.base import Document
+from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.messages.ai import AIMessage, AIMessageChunk
+from langchain_core.prompt_values import PromptValue
+from langchain_core.runnables.base import Runnable
+from langchain_core.runnables.retry import RunnableRetry
+from tenacity import retry_if_exception
+
+# rough number of characters per token, used to estimate the length of a text without a tokenizer
+CHARACTERS_PER_TOKEN = 4
+
+# chat model fields limiting the number of generated tokens, by order of precedence (`num_predict`
+# for Ollama, `max_output_tokens` for Google models and `max_tokens` for most other providers)
+OUTPUT_TOKEN_LIMIT_FIELDS = ('num_predict', 'max_output_tokens', 'max_tokens')
+
+# errors retried with backoff by the services, and sent to their fallback chat model: timeouts,
+# connection errors, rate limits (429) and server errors (5xx). other errors (e.g., authentication
+# or invalid requests) are not transient, so they fail on the first attempt
+TRANSIENT_ERRORS = (
+    TimeoutError,
+    ConnectionError,
+    httpx.TimeoutException,
+    httpx.NetworkError,
+    httpx.RemoteProtocolError,
+    google_exceptions.TooManyRequests,
+    google_exceptions.ServerError,
+)
+
+
+def join_page_contents(content: Sequence[Document]) -> str:
+    """
+    Joins the text content of a sequence of `Document` objects, separated by newlines.
+
+    Parameters
+    ----------
+    content : Sequence[Document]
+        A list of `Document` objects to extract text from.
+
+    Returns
+    -------
+    str
+        The combined text content from all documents. If there is a single document, its text
+        content is returned without being copied.
+    """
+    return "\n".join(page.page_content for page in content)
+
+
+def get_max_summary_tokens(prompt: PromptValue, text_percentage: int, margin: float = 1.1) -> int:
+    """
+    Estimates the maximum number of tokens of a summary targeting a percentage of a prompt.
+
+    The length of the prompt is computed from the content of its messages, so the text to be
+    summarized is not copied into a single string.
+
+    Parameters
+    ----------
+    prompt : PromptValue
+        The formatted prompt containing the text to be summarized.
+    text_percentage : int
+        The percentage of the length of the prompt targeted by the summary.
+    margin : float, optional
+        The factor applied to the target length, so that summaries slightly longer than the
+        target are not truncated (default is 1.1).
+
+    Returns
+    -------
+    int
+        The estimated maximum number of tokens, with a minimum of 32 tokens for short prompts.
+    """
+    prompt_length = sum(len(message.content) for message in prompt.to_messages())
+    prompt_tokens = prompt_length / CHARACTERS_PER_TOKEN
+    return math.ceil(prompt_tokens * text_percentage / 100 * margin) + 32
+
+
+def get_chatmodel_name(chatmodel: BaseChatModel) -> str:
+    """
+    Identifies a chat model by its class and model name.
+
+    Unlike the representation of the chat model, the name does not include its clients, so it
+    is the same in every process.
+
+    Parameters
+    ----------
+    chatmodel : BaseChatModel
+        The chat model to be identified.
+
+    Returns
+    -------
+    str
+        The class name of the chat model, followed by its model name if it has one.
+    """
+    model_name = getattr(chatmodel, 'model', None) or getattr(chatmodel, 'model_name', None)
+    return f"{type(chatmodel).__name__}:{model_name}"
+
+
+def limit_output_tokens(chatmodel: BaseChatModel, max_output_tokens: int) -> BaseChatModel:
+    """
+    Limits the number of tokens generated by a chat model.
+
+    The limit is set on a shallow copy of the chat model, so the original chat model is not
+    modified and its HTTP clients and cache are shared by the copy.
+
+    Parameters
+    ----------
+    chatmodel : BaseChatModel
+        The chat model to be limited.
+    max_output_tokens : int
+        The maximum number of tokens to be generated.
+
+    Returns
+    -------
+    BaseChatModel
+        A copy of the chat model limited to `max_output_tokens`, or the chat model itself if it
+        already has a lower limit or does not have any of the `OUTPUT_TOKEN_LIMIT_FIELDS`.
+    """
+    for field in OUTPUT_TOKEN_LIMIT_FIELDS:
+        if field in type(chatmodel).model_fields:
+            current_limit = getattr(chatmodel, field)
+            if current_limit is not None and current_limit <= max_output_tokens:
+                return chatmodel
+            return chatmodel.model_copy(update={field: max_output_tokens})
+    return chatmodel
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """
+    Determines whether a failed chat model call is worth retrying.
+
+    Clients such as Ollama's raise the same exception class for every HTTP error, so their
+    transient errors are told apart from client errors (e.g., unknown model) by status code.
+
+    Parameters
+    ----------
+    error : BaseException
+        The error raised by the call.
+
+    Returns
+    -------
+    bool
+        Whether the error is one of the `TRANSIENT_ERRORS` or has a 429 or 5xx `status_code`.
+    """
+    if isinstance(error, TRANSIENT_ERRORS):
+        return True
+    status_code = getattr(error, 'status_code', None)
+    return isinstance(status_code, int) and (status_code == 429 or status_code >= 500)
+
+
+class TransientErrorRetry(RunnableRetry):
+    """
+    Retries a runnable, with exponential backoff, only when it fails with a transient error.
+
+    `Runnable.with_retry` only filters errors by their type, so the retry condition is replaced
+    by `is_transient_error`.
+    """
+
+    @property
+    def _kwargs_retrying(self) -> dict[str, Any]:
+        return {**super()._kwargs_retrying, 'retry': retry_if_exception(is_transient_error)}
+
+
+def with_transient_retry(runnable: Runnable, max_attempts: int) -> Runnable:
+    """
+    Wraps a runnable so that calls failing with a transient error are retried.
+
+    Parameters
+    ----------
+    runnable : Runnable
+        The runnable to be retried.
+    max_attempts : int
+        The maximum number of attempts, with exponential backoff between them.
+
+    Returns
+    -------
+    Runnable
+        The runnable retried on the errors accepted by `is_transient_error`.
+    """
+    return TransientErrorRetry(
+        bound=runnable,
+        max_attempt_number=max_attempts,
+        wait_exponential_jitter=True,
+    )
 
 
 class BaseService(ABC):
@@ -15,14 +201,15 @@ class BaseService(ABC):
     """
 
     @abstractmethod
-    def run(self, content: list[Document]) -> AIMessage:
+    async def run(self, content: Sequence[Document]) -> AIMessage:
         """
         Executes the service's main functionality on the provided documents.
 
         Parameters
         ----------
-        content : list[Document]
-            A list of `Document` objects to process.
+        content : Sequence[Document]
+            The `Document` objects to process. The same content may be shared with other
+            services running concurrently, so it must not be modified.
 
         Returns
         -------
@@ -31,6 +218,30 @@ class BaseService(ABC):
         """
         pass
 
+    async def stream(self, content: Sequence[Document]) -> AsyncIterator[AIMessageChunk]:
+        """
+        Executes the service on the provided documents, yielding the output as it is generated.
+
+        Services that cannot stream their output yield it as a single chunk once it is complete.
+
+        Parameters
+        ----------
+        content : Sequence[Document]
+            The `Document` objects to process, treated as read-only.
+
+        Yields
+        ------
+        AIMessageChunk
+            The chunks of the output of the service.
+        """
+        generated = await self.run(content=content)
+        yield AIMessageChunk(
+            id=generated.id,
+            content=generated.content,
+            response_metadata=generated.response_metadata,
+            usage_metadata=generated.usage_metadata,
+        )
+
     @abstractmethod
     def get_metadata(self, file: str, gen_metadata: dict) -> dict[str, Any]:
         """
@@ -50,6 +261,32 @@ class BaseService(ABC):
         """
         pass
 
+    def get_parameters(self) -> dict[str, Any]:
+        """
+        Retrieves the parameters determining the output of the service (e.g., chat model and
+        prompt), so that stored outputs are only reused by services with the same parameters.
+
+        Returns
+        -------
+        dict[str, Any]
+            A JSON-serializable dictionary of parameters (default is empty).
+        """
+        return {}
+
+    @cached_property
+    def parameters_hash(self) -> str:
+        """
+        Hash of the parameters of the service, stored along with each of its outputs.
+
+        Returns
+        -------
+        str
+            The SHA-256 hash of the parameters returned by `get_parameters`, computed once per
+            service instance.
+        """
+        parameters = orjson.dumps(self.get_parameters(), option=orjson.OPT_SORT_KEYS)
+        return hashlib.sha256(parameters).hexdigest()
+
     def get_logging_information(self) -> dict:
         """
         Retrieves logging-specific information for the service.
@@ -72,13 +309,13 @@ class BaseService(ABC):
         """
         self.logger = logger
 
-    def _get_text_from_content(self, content: list[Document]) -> str:
+    def _get_text_from_content(self, content: Sequence[Document]) -> str:
         """
-        Extracts the text content from a list of `Document` objects.
+        Extracts the text content from a sequence of `Document` objects.
 
         Parameters
         ----------
-        content : list[Document]
+        content : Sequence[Document]
             A list of `Document` objects to extract text from.
 
         Returns
@@ -86,7 +323,7 @@ class BaseService(ABC):
         str
             The combined text content from all documents, separated by newlines.
         """
-        return "".join([page.page_content + "\n" for page in content])
+        return join_page_contents(content=content)
 
     def _get_content_from_chunks(self, chunks: list[AIMessageChunk]) -> str:
         """
@@ -102,7 +339,7 @@ class BaseService(ABC):
         str
             The combined content from all chunks.
         """
-        return "".join([c.content for c in chunks])
+        return "".join(c.content for c in chunks)
 
     def _get_base_metadata(self, file: str, gen_metadata: dict) -> dict[str, Any]:
         """
@@ -124,5 +361,5 @@ class BaseService(ABC):
         return {
             'input_file': file,
             **gen_metadata.response_metadata,
-            **gen_metadata.usage_metadata,
+            **(gen_metadata.usage_metadata or {}),
         }
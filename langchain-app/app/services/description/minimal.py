@@ -1,8 +1,18 @@
+import textwrap
+from functools import cached_property
+
 from langchain.prompts import ChatPromptTemplate
 
 from app.services import MinimalService, ServiceTypes
 
 
+DESCRIPTION_INSTRUCTIONS = textwrap.dedent("""
+    Describe the document in 2 to 3 sentences, outlining its main purpose.
+    Same language as the document. At most {max_tokens} tokens.
+    Output only the description, no introduction.
+""").strip()
+
+
 class Descriptor(MinimalService):
     """
     A service for generating concise descriptions of documents.
@@ -20,7 +30,7 @@ class Descriptor(MinimalService):
     def service_type(self) -> str:
         return ServiceTypes.DESCRIPTION
 
-    @property
+    @cached_property
     def prompt(self) -> ChatPromptTemplate:
         """
         Generates the prompt template for the description task.
@@ -34,18 +44,9 @@ class Descriptor(MinimalService):
             The chat prompt template with instructions for the description task.
         """
         return ChatPromptTemplate.from_messages([
-            (
-                self.message_type,
-                """
-                Generate only a 2 to 3 sentence description of this document in the same language
-                as the original document. Make sure to outline the main purpose of the document
-                in your description.
-                """
-            ),
-            (self.message_type, f"Your output should contain at most {self.max_tokens} tokens."),
-            (self.message_type, "Do not use introduction phrases, just output the description."),
-            ("human", "{text}")
-        ])
+            (self.message_type, DESCRIPTION_INSTRUCTIONS),
+            ("human", "{text}"),
+        ]).partial(max_tokens=self.max_tokens)
 
     def get_logging_information(self) -> dict:
         """
@@ -1,12 +1,19 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Sequence
+from functools import cached_property
 from typing import Any, Dict
 
 from langchain_core.documents.base import Document
 from langchain_core.language_models.chat_models import BaseChatModel
-from langchain_core.messages.ai import AIMessage
+from langchain_core.messages.ai import AIMessage, AIMessageChunk
 from langchain_core.runnables.base import Runnable
 
-from app.services.base import BaseService
+from app.services.base import (
+    TRANSIENT_ERRORS,
+    BaseService,
+    get_chatmodel_name,
+    with_transient_retry,
+)
 
 
 class MinimalService(BaseService, ABC):
@@ -18,7 +25,13 @@ class MinimalService(BaseService, ABC):
     subclasses to implement prompts and service types.
     """
 
-    def __init__(self, chatmodel: BaseChatModel, has_system_msg_support: bool = False):
+    def __init__(
+        self,
+        chatmodel: BaseChatModel,
+        has_system_msg_support: bool = False,
+        fallback_chatmodel: BaseChatModel | None = None,
+        max_attempts: int = 3,
+    ):
         """
         Initializes the `MinimalService` with a chat model and optional system message support.
 
@@ -28,9 +41,17 @@ class MinimalService(BaseService, ABC):
             The chat model to be used for the service's execution.
         has_system_msg_support : bool, optional
             Indicates whether the chat model supports system messages (default is False).
+        fallback_chatmodel : BaseChatModel | None, optional
+            The chat model used when `chatmodel` keeps failing after all attempts (default is
+            None, meaning no fallback).
+        max_attempts : int, optional
+            The maximum number of attempts on `chatmodel` before failing or falling back, with
+            exponential backoff between them (default is 3).
         """
         self.chatmodel = chatmodel
         self.has_system_msg_support = has_system_msg_support
+        self.fallback_chatmodel = fallback_chatmodel
+        self.max_attempts = max_attempts
 
     @property
     @abstractmethod
@@ -38,6 +59,9 @@ class MinimalService(BaseService, ABC):
         """
         Abstract property to define the prompt template for the service.
 
+        Implementations are expected to build the template only once per service instance
+        (e.g., with `functools.cached_property`), as it is accessed on every execution.
+
         Returns
         -------
         ChatPromptTemplate
@@ -70,33 +94,147 @@ class MinimalService(BaseService, ABC):
         """
         return "system" if self.has_system_msg_support else "human"
 
-    @property
+    @cached_property
     def runnable(self) -> Runnable:
         """
         Combines the service's prompt and chat model into a runnable chain.
 
+        The chain is built once per service instance, on first access. Calls failing with a
+        transient error (see `is_transient_error`) are retried up to `max_attempts` times, and
+        calls still failing with one of the `TRANSIENT_ERRORS` are then sent to
+        `fallback_chatmodel`, if configured.
+
         Returns
         -------
         Runnable
             A runnable chain consisting of the prompt and the chat model.
         """
-        return self.prompt | self.chatmodel
+        runnable = with_transient_retry(
+            runnable=self.prompt | self._get_chatmodel_step(),
+            max_attempts=self.max_attempts,
+        )
+        if self.fallback_chatmodel is not None:
+            runnable = runnable.with_fallbacks(
+                [self.prompt | self.fallback_chatmodel],
+                exceptions_to_handle=TRANSIENT_ERRORS,
+            )
+        return runnable
 
-    def run(self, content: list[Document]) -> AIMessage:
+    def _get_chatmodel_step(self) -> Runnable:
+        """
+        Defines the step of the runnable chain sending the formatted prompt to the chat model.
+
+        Returns
+        -------
+        Runnable
+            The chat model itself.
+        """
+        return self.chatmodel
+
+    @cached_property
+    def chatmodel_repr(self) -> str:
+        """
+        Representation of the chat model, stored in the metadata of every generation.
+
+        Returns
+        -------
+        str
+            The representation of the chat model, computed once per service instance.
+        """
+        return repr(self.chatmodel)
+
+    @cached_property
+    def prompt_repr(self) -> str:
+        """
+        Representation of the prompt template, stored in the metadata of every generation.
+
+        Returns
+        -------
+        str
+            The representation of the prompt template, computed once per service instance.
+        """
+        return repr(self.prompt)
+
+    async def run(self, content: Sequence[Document]) -> AIMessage:
         """
         Executes the service by processing the input documents through the runnable chain.
 
         Parameters
         ----------
-        content : list[Document]
-            A list of documents to be processed.
+        content : Sequence[Document]
+            The documents to be processed.
 
         Returns
         -------
         AIMessage
             The output message generated by the chat model.
         """
-        return self.runnable.ainvoke({"text": self._get_text_from_content(content=content)})
+        return await self.runnable.ainvoke({"text": self._get_text_from_content(content=content)})
+
+    async def stream(self, content: Sequence[Document]) -> AsyncIterator[AIMessageChunk]:
+        """
+        Executes the service, yielding the output message as it is generated by the chat model.
+
+        Parameters
+        ----------
+        content : Sequence[Document]
+            The documents to be processed.
+
+        Yields
+        ------
+        AIMessageChunk
+            The chunks of the output message generated by the chat model.
+        """
+        text = self._get_text_from_content(content=content)
+        async for chunk in self.runnable.astream({"text": text}):
+            yield chunk
+
+    async def batch_run(
+        self,
+        contents: Sequence[Sequence[Document]],
+        max_concurrency: int = 16,
+    ) -> list[AIMessage]:
+        """
+        Executes the service on several documents at once, for non-interactive workloads.
+
+        The inputs are sent through the runnable chain as a batch, so providers with native
+        batching process them together, and others receive at most `max_concurrency`
+        concurrent requests.
+
+        Parameters
+        ----------
+        contents : Sequence[Sequence[Document]]
+            The documents of each input to be processed.
+        max_concurrency : int, optional
+            The maximum number of inputs processed at the same time (default is 16).
+
+        Returns
+        -------
+        list[AIMessage]
+            The output messages generated by the chat model, in the same order as `contents`.
+        """
+        return await self.runnable.abatch(
+            [{"text": self._get_text_from_content(content=content)} for content in contents],
+            config={"max_concurrency": max_concurrency},
+        )
+
+    def get_parameters(self) -> dict[str, Any]:
+        """
+        Retrieves the parameters determining the output of the service.
+
+        Parameters specific to each service (e.g., `target_language`) are filled in the prompt
+        template, so they are covered by its representation.
+
+        Returns
+        -------
+        dict[str, Any]
+            The service type, the name of the chat model and the representation of the prompt.
+        """
+        return {
+            'service_type': self.service_type,
+            'chatmodel': get_chatmodel_name(self.chatmodel),
+            'prompt': self.prompt_repr,
+        }
 
     def get_metadata(self, file: str, gen_metadata: Dict) -> Dict[str, Any]:
         """
@@ -118,8 +256,8 @@ class MinimalService(BaseService, ABC):
         metadata = self._get_base_metadata(file=file, gen_metadata=gen_metadata)
         metadata.update({
             'service_type': self.service_type,
-            'chatmodel': repr(self.chatmodel),
-            'prompt': repr(self.prompt),
+            'chatmodel': self.chatmodel_repr,
+            'prompt': self.prompt_repr,
             'has_system_msg_support': self.has_system_msg_support,
         })
         return metadata
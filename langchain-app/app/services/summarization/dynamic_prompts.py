@@ -1,12 +1,65 @@
-from typing import Any, AsyncIterator
+import asyncio
+import textwrap
+from collections.abc import AsyncIterator, Sequence
+from functools import cached_property
+from types import MappingProxyType
+from typing import Any
 
 from langchain_core.documents.base import Document
-from langchain_core.messages.ai import AIMessageChunk, AIMessage
+from langchain_core.messages.ai import AIMessage, AIMessageChunk
 from langchain.chat_models.base import BaseChatModel
-from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.prompt_values import PromptValue
+from langchain_core.messages.human import HumanMessage
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.runnables.base import RunnableLambda
 
-from app.models import DocumentInfo
-from app.services.base import BaseService
+from app.models import DocumentInfo, SummarizationBundle
+from app.services.base import (
+    BaseService,
+    get_chatmodel_name,
+    get_max_summary_tokens,
+    limit_output_tokens,
+    with_transient_retry,
+)
+
+
+# length of the summaries requested by the summarization prompts (in percentage of the text)
+SUMMARY_TEXT_PERCENTAGE = 30
+
+# document information used to summarize the text when the extraction does not finish in time
+UNKNOWN_DOCUMENT_INFO = MappingProxyType(dict.fromkeys(DocumentInfo.model_fields))
+
+
+EXTRACTION_INSTRUCTIONS = textwrap.dedent("""
+    Extract the requested attributes from the text, concise and in the required format.
+    Use 'null' for attributes that cannot be determined from the text.
+""").strip()
+
+
+SUMMARIZATION_INSTRUCTIONS = textwrap.dedent("""
+    Write a detailed summary of the text, about 30% of the original length.
+    Prioritize major themes, critical points and the details supporting them.
+    Exclude redundant or trivial information. Document profile:
+    - Text Type: {text_type} (e.g., report, presentation, article)
+    - Media Type: {media_type} (e.g., PDF, PPT, DOC)
+    - Domain: {document_domain} (e.g., finance, medical, legal)
+    - Audience: {audience} (e.g., general, experts)
+    - Audience Expertise: {audience_expertise} (e.g., beginner, intermediate, advanced)
+    - Focus on Document Key Points: {key_points}
+    Same language, tone and style as the document. No introductions or external
+    knowledge.
+""").strip()
+
+
+SINGLE_PASS_INSTRUCTIONS = textwrap.dedent("""
+    First, identify the text type, media type, domain, audience, audience expertise and
+    key points of the text. Use 'null' for attributes that cannot be determined.
+    Then, guided by them, write a detailed summary, about 30% of the original length.
+    Prioritize major themes, critical points and the details supporting them.
+    Exclude redundant or trivial information.
+    Same language, tone and style as the document. No introductions or external
+    knowledge.
+""").strip()
 
 
 class DynamicPromptSummarizer(BaseService):
@@ -17,12 +70,21 @@ class DynamicPromptSummarizer(BaseService):
     This class leverages a dual-model setup:
     - One model for extraction tasks.
     - Another model for summarization tasks.
+
+    Alternatively, in single-pass mode, the summarization model extracts the information and
+    generates the summary in a single structured output, saving one round-trip to the model.
+
+    The time spent waiting for the extraction can be bounded with `extraction_timeout`, after
+    which the text is summarized without document information.
     """
 
     def __init__(
         self,
         chatmodel: BaseChatModel,
         extraction_chatmodel: BaseChatModel,
+        single_pass: bool = False,
+        max_attempts: int = 3,
+        extraction_timeout: float | None = None,
         **kwargs,
     ) -> None:
         """
@@ -34,14 +96,26 @@ class DynamicPromptSummarizer(BaseService):
             The language model used for summarization tasks.
         extraction_chatmodel : BaseChatModel
             The language model used for structured data extraction tasks.
+        single_pass : bool, optional
+            Whether to extract the information and generate the summary in a single call to
+            `chatmodel` (default is False). The model must support structured output.
+        max_attempts : int, optional
+            The maximum number of attempts on each chain before failing on a transient error
+            (see `is_transient_error`), with exponential backoff between them (default is 3).
+        extraction_timeout : float | None, optional
+            The maximum time, in seconds, to wait for the document information before
+            summarizing without it (default is None, for no limit).
         **kwargs
             Additional keyword arguments passed to the parent `BaseService` class.
         """
         super().__init__(**kwargs)
         self.chatmodel = chatmodel
         self.extraction_chatmodel = extraction_chatmodel
+        self.single_pass = single_pass
+        self.max_attempts = max_attempts
+        self.extraction_timeout = extraction_timeout
 
-    @property
+    @cached_property
     def extraction_prompt(self) -> ChatPromptTemplate:
         """
         Defines the prompt template for extracting structured information.
@@ -52,20 +126,11 @@ class DynamicPromptSummarizer(BaseService):
             The prompt template for the extraction task.
         """
         return ChatPromptTemplate.from_messages([
-            (
-                "human",
-                """
-                You are an expert extraction algorithm, specialized in extracting structured
-                information. Your task is to accurately identify and extract relevant attributes
-                from the provided text. For each attribute, if the value cannot be determined from
-                the text, return 'null' as the attribute's value. Ensure the extracted information
-                is concise, relevant, and structured according to the required format.
-                """
-            ),
-            ("human", "{text}"),
+            ("human", EXTRACTION_INSTRUCTIONS),
+            MessagesPlaceholder(variable_name="document"),
         ])
 
-    @property
+    @cached_property
     def summarization_prompt(self) -> ChatPromptTemplate:
         """
         Defines the prompt template for generating summaries.
@@ -76,94 +141,308 @@ class DynamicPromptSummarizer(BaseService):
             The prompt template for the summarization task.
         """
         return ChatPromptTemplate.from_messages([
-            (
-                "human",
-                """
-                You are an advanced AI specializing in identifying and summarizing the most
-                important and relevant information from complex documents. Your task is to create
-                a detailed summary by focusing on the key ideas, core arguments, and supporting
-                details.
-                """
-            ),
-            (
-                "human",
-                """
-                Ensure the summary is approximately 30% of the original length. Prioritize the
-                following:
-                - Major themes and critical points
-                - Important supporting details that enhance the key points
-                - Exclude redundant or trivial information
-                """
-            ),
-            (
-                "human",
-                """
-                Follow these guidelines when generating the summary:
-                - Text Type: {text_type} (e.g., report, presentation, article)
-                - Media Type: {media_type} (e.g., PDF, PPT, DOC)
-                - Domain: {document_domain} (e.g., finance, medical, legal)
-                - Audience: {audience} (e.g., general, experts)
-                - Audience Expertise: {audience_expertise} (e.g., beginner, intermediate, advanced)
-                - Focus on Document Key Points: {key_points}
-                """
-            ),
-            (
-                "human",
-                """
-                The summary must be written in the same language as the input document, maintaining
-                the document’s formal tone and style. Avoid introductory phrases and external
-                knowledge. Simply focus on what is present in the document itself.
-                """
-            ),
-            ("human", "{text}"),
+            ("human", SUMMARIZATION_INSTRUCTIONS),
+            MessagesPlaceholder(variable_name="document"),
         ])
 
-    @property
+    @cached_property
+    def single_pass_prompt(self) -> ChatPromptTemplate:
+        """
+        Defines the prompt template for extracting information and summarizing in a single pass.
+
+        Returns
+        -------
+        ChatPromptTemplate
+            The prompt template for the combined extraction and summarization task.
+        """
+        return ChatPromptTemplate.from_messages([
+            ("human", SINGLE_PASS_INSTRUCTIONS),
+            MessagesPlaceholder(variable_name="document"),
+        ])
+
+    @cached_property
+    def single_pass_chain(self):
+        """
+        Combines the single-pass prompt and the summarization model to form an execution chain.
+
+        The raw model message is included in the output so that its generation metadata is kept.
+
+        Returns
+        -------
+        Any
+            A chain object combining the prompt and the model with structured output.
+        """
+        return with_transient_retry(
+            runnable=(
+                self.single_pass_prompt
+                | self.chatmodel.with_structured_output(
+                    schema=SummarizationBundle,
+                    include_raw=True,
+                )
+            ),
+            max_attempts=self.max_attempts,
+        )
+
+    @cached_property
     def extraction_chain(self):
         """
         Combines the extraction prompt and the extraction model to form an execution chain.
 
+        The chain is built once per service instance, so the structured output schema is bound
+        to the extraction model only once.
+
         Returns
         -------
         Any
             A chain object combining the prompt and the model with structured output.
         """
-        return (
-            self.extraction_prompt
-            | self.extraction_chatmodel.with_structured_output(schema=DocumentInfo)
+        return with_transient_retry(
+            runnable=(
+                self.extraction_prompt
+                | self.extraction_chatmodel.with_structured_output(schema=DocumentInfo)
+            ),
+            max_attempts=self.max_attempts,
         )
 
-    @property
+    @cached_property
     def summarization_chain(self):
         """
         Combines the summarization prompt and the summarization model to form an execution chain.
 
+        The number of tokens generated by the summarization model is limited to the length
+        requested by the prompt, estimated from the length of each input.
+
         Returns
         -------
         Any
             A chain object combining the prompt and the summarization model.
         """
-        return self.summarization_prompt | self.chatmodel
+        return with_transient_retry(
+            runnable=self.summarization_prompt | RunnableLambda(self._get_limited_chatmodel),
+            max_attempts=self.max_attempts,
+        )
+
+    @cached_property
+    def generation_settings(self) -> dict[str, str]:
+        """
+        Representations of the models, prompts and schema used by the service, stored in the
+        metadata of every generation.
+
+        The representations are computed once per service instance, as rendering the prompt
+        templates walks every message template they contain.
+
+        Returns
+        -------
+        dict[str, str]
+            The representations of the models, prompts and schema used in the current mode.
+        """
+        if self.single_pass:
+            return {
+                'chatmodel': repr(self.chatmodel),
+                'single_pass_prompt': repr(self.single_pass_prompt),
+                'structured_straction_schema': SummarizationBundle.__name__,
+            }
+
+        return {
+            'chatmodel': repr(self.chatmodel),
+            'summarization_prompt': repr(self.summarization_prompt),
+            'extraction_chatmodel': repr(self.extraction_chatmodel),
+            'extraction_prompt': repr(self.extraction_prompt),
+            'structured_straction_schema': DocumentInfo.__name__,
+        }
+
+    def get_parameters(self) -> dict[str, Any]:
+        """
+        Retrieves the parameters determining the generated summaries.
+
+        Returns
+        -------
+        dict[str, Any]
+            The generation settings, with the chat models identified by their names.
+        """
+        parameters = {**self.generation_settings, 'chatmodel': get_chatmodel_name(self.chatmodel)}
+        if not self.single_pass:
+            parameters['extraction_chatmodel'] = get_chatmodel_name(self.extraction_chatmodel)
+        return parameters
+
+    async def run(self, content: Sequence[Document]) -> AIMessage:
+        """
+        Executes the summarization on the provided documents.
+
+        Parameters
+        ----------
+        content : Sequence[Document]
+            The `Document` objects to be summarized.
+
+        Returns
+        -------
+        AIMessage
+            The generated summary.
+        """
+        return await self.summarize(content=content)
 
-    def summarize(self, content: list[Document]) -> AsyncIterator[AIMessageChunk] | AIMessage:
+    async def summarize(self, content: Sequence[Document]) -> AIMessage:
         """
         Summarizes the given content using both extraction and summarization chains.
 
+        Both chains are invoked asynchronously, so the event loop is not blocked while waiting
+        for the extraction. The message containing the text is built once and shared by both
+        prompts.
+
+        Parameters
+        ----------
+        content : Sequence[Document]
+            The `Document` objects to be summarized.
+
+        Returns
+        -------
+        AIMessage
+            The generated summary.
+        """
+        document = self._get_document_messages(content=content)
+        if self.single_pass:
+            return await self._summarize_single_pass(document=document)
+
+        document_info = await self._extract_document_info(document=document)
+        return await self.summarization_chain.ainvoke({"document": document, **document_info})
+
+    async def stream(self, content: Sequence[Document]) -> AsyncIterator[AIMessageChunk]:
+        """
+        Summarizes the given content, yielding the summary as it is generated.
+
+        The extraction must finish (or reach `extraction_timeout`) before the summary starts
+        being generated. In single-pass mode the structured output cannot be streamed, so the
+        summary is yielded as a single chunk once it is complete.
+
+        Parameters
+        ----------
+        content : Sequence[Document]
+            The `Document` objects to be summarized.
+
+        Yields
+        ------
+        AIMessageChunk
+            The chunks of the generated summary.
+        """
+        if self.single_pass:
+            async for chunk in super().stream(content=content):
+                yield chunk
+            return
+
+        document = self._get_document_messages(content=content)
+        document_info = await self._extract_document_info(document=document)
+        async for chunk in self.summarization_chain.astream(
+            {"document": document, **document_info}
+        ):
+            yield chunk
+
+    async def summarize_many(
+        self,
+        contents: Sequence[Sequence[Document]],
+        max_concurrency: int = 16,
+    ) -> list[AIMessage]:
+        """
+        Summarizes several documents concurrently.
+
+        Parameters
+        ----------
+        contents : Sequence[Sequence[Document]]
+            The `Document` objects of each document to be summarized.
+        max_concurrency : int, optional
+            The maximum number of documents summarized at the same time (default is 16).
+
+        Returns
+        -------
+        list[AIMessage]
+            The generated summaries, in the same order as `contents`.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def summarize_with_limit(content: Sequence[Document]) -> AIMessage:
+            async with semaphore:
+                return await self.summarize(content=content)
+
+        return await asyncio.gather(*(summarize_with_limit(content) for content in contents))
+
+    def _get_document_messages(self, content: Sequence[Document]) -> list[HumanMessage]:
+        """
+        Builds the message containing the text of the document, shared by every prompt of the
+        service so that the text is not formatted into each of them.
+        """
+        return [HumanMessage(content=self._get_text_from_content(content=content))]
+
+    async def _get_limited_chatmodel(self, prompt: PromptValue) -> BaseChatModel:
+        """
+        Limits the summarization model to the number of tokens targeted for a prompt, which is
+        then invoked with the returned chat model.
+        """
+        max_output_tokens = get_max_summary_tokens(
+            prompt=prompt,
+            text_percentage=SUMMARY_TEXT_PERCENTAGE,
+        )
+        return limit_output_tokens(chatmodel=self.chatmodel, max_output_tokens=max_output_tokens)
+
+    async def _extract_document_info(self, document: list[HumanMessage]) -> dict[str, Any]:
+        """
+        Extracts the document information guiding the summary, waiting for it at most
+        `extraction_timeout` seconds.
+
         Parameters
         ----------
-        content : list[Document]
-            A list of `Document` objects to be summarized.
+        document : list[HumanMessage]
+            The message containing the text to be summarized.
 
         Returns
         -------
-        AsyncIterator[AIMessageChunk] or AIMessage
-            The generated summary, either as an asynchronous stream or a single message.
+        dict[str, Any]
+            The extracted document information, or `UNKNOWN_DOCUMENT_INFO` if the extraction
+            did not finish in time (in which case it is cancelled).
         """
-        text = self._get_text_from_content(content=content)
-        structured_information = self.extraction_chain.invoke({"text": text})
-        return self.summarization_chain.ainvoke({"text": text, **structured_information.dict()})
+        deadline = asyncio.timeout(self.extraction_timeout)
+        try:
+            async with deadline:
+                structured_information = await self.extraction_chain.ainvoke(
+                    {"document": document}
+                )
+        except TimeoutError:
+            # timeouts raised by the extraction itself are not a missed deadline
+            if not deadline.expired():
+                raise
+            return dict(UNKNOWN_DOCUMENT_INFO)
+        return structured_information.model_dump()
 
-    def get_metadata(self, file: str, generation_metadata: dict) -> dict[str, Any]:
+    async def _summarize_single_pass(self, document: list[HumanMessage]) -> AIMessage:
+        """
+        Extracts the document information and summarizes the text in a single model call.
+
+        Parameters
+        ----------
+        document : list[HumanMessage]
+            The message containing the text to be summarized.
+
+        Returns
+        -------
+        AIMessage
+            The generated summary, with the generation metadata of the raw model message.
+
+        Raises
+        ------
+        ValueError
+            If the model output could not be parsed into a `SummarizationBundle`.
+        """
+        output = await self.single_pass_chain.ainvoke({"document": document})
+        if output["parsed"] is None:
+            raise ValueError(f"Failed to parse single-pass summary: {output['parsing_error']}")
+
+        raw: AIMessage = output["raw"]
+        return AIMessage(
+            id=raw.id,
+            content=output["parsed"].summary,
+            response_metadata=raw.response_metadata,
+            usage_metadata=raw.usage_metadata,
+        )
+
+    def get_metadata(self, file: str, gen_metadata: dict) -> dict[str, Any]:
         """
         Retrieves metadata for the summarization task, including model and prompt details.
 
@@ -171,7 +450,7 @@ class DynamicPromptSummarizer(BaseService):
         ----------
         file : str
             The name of the file being processed.
-        generation_metadata : dict
+        gen_metadata : dict
             Additional metadata about the generation process.
 
         Returns
@@ -179,12 +458,6 @@ class DynamicPromptSummarizer(BaseService):
         dict[str, Any]
             A dictionary containing the combined metadata.
         """
-        metadata = self._get_base_metadata(file=file, generation_metadata=generation_metadata)
-        metadata.update({
-            'chatmodel': repr(self.chatmodel),
-            "summarization_prompt": repr(self.summarization_prompt),
-            'extraction_chatmodel': repr(self.extraction_chatmodel),
-            "extraction_prompt": repr(self.extraction_prompt),
-            "structured_straction_schema": DocumentInfo.__class__.__name__,
-        })
+        metadata = self._get_base_metadata(file=file, gen_metadata=gen_metadata)
+        metadata.update(self.generation_settings)
         return metadata
@@ -1,6 +1,24 @@
+import textwrap
+from functools import cached_property
+
 from langchain.prompts import ChatPromptTemplate
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.prompt_values import PromptValue
+from langchain_core.runnables.base import Runnable, RunnableLambda
 
 from app.services import MinimalService, ServiceTypes
+from app.services.base import get_max_summary_tokens, limit_output_tokens
+
+
+SUMMARIZATION_INSTRUCTIONS = textwrap.dedent("""
+    Summarize the text. Focus on key points, central themes and significant details.
+    Length: about {text_percentage}% of the original. Skip superficial details.
+    - Same language as the text
+    - Write for the document's intended audience
+    - Keep the original tone and style
+    - No introductions, conclusions or external knowledge
+    - No first person verbs
+""").strip()
 
 
 class Summarizer(MinimalService):
@@ -9,7 +27,8 @@ class Summarizer(MinimalService):
 
     The `Summarizer` focuses on producing multi-language summaries that retain key points,
     central themes, and significant details, while adhering to a percentage-based length
-    constraint.
+    constraint. The percentage is also enforced as a limit on the number of generated tokens,
+    estimated from the length of each input.
     """
 
     def __init__(self, text_percentage: int = 30, **kwargs):
@@ -38,7 +57,7 @@ class Summarizer(MinimalService):
         """
         return ServiceTypes.SUMMARIZATION
 
-    @property
+    @cached_property
     def prompt(self) -> ChatPromptTemplate:
         """
         Defines the prompt template for the summarization task.
@@ -49,34 +68,32 @@ class Summarizer(MinimalService):
             The prompt template for generating summaries based on key points, themes, and details.
         """
         return ChatPromptTemplate.from_messages([
-            (
-                self.message_type,
-                """
-                You are an AI specialized in multi-language summaries. Your task is to summarize
-                the provided text by focusing on the key points, central themes, and significant
-                details.
-                """
-            ),
-            (
-                self.message_type,
-                f"""
-                Ensure the summary is approximately {self.text_percentage}% of the original text
-                length. Avoid superficial details or unnecessary information.
-                """
-            ),
-            (
-                self.message_type,
-                """
-                Follow these additional guidelines to generate the summary:
-                - Produce the summary in the same language as the input text
-                - Assume the document’s intended audience
-                - Keep the tone and style consistent with the original
-                - Do not add introductions, conclusions, or external knowledge
-                - Do not use verbs in the first person
-                """
-            ),
-            ("human", "{text}")
-        ])
+            (self.message_type, SUMMARIZATION_INSTRUCTIONS),
+            ("human", "{text}"),
+        ]).partial(text_percentage=self.text_percentage)
+
+    def _get_chatmodel_step(self) -> Runnable:
+        """
+        Defines the step of the runnable chain sending the formatted prompt to the chat model,
+        limited to the number of tokens targeted by `text_percentage`.
+
+        Returns
+        -------
+        Runnable
+            A step sending the prompt to a copy of the chat model with the output token limit.
+        """
+        return RunnableLambda(self._get_limited_chatmodel)
+
+    async def _get_limited_chatmodel(self, prompt: PromptValue) -> BaseChatModel:
+        """
+        Limits the chat model to the number of tokens targeted for a prompt, which is then
+        invoked with the returned chat model.
+        """
+        max_output_tokens = get_max_summary_tokens(
+            prompt=prompt,
+            text_percentage=self.text_percentage,
+        )
+        return limit_output_tokens(chatmodel=self.chatmodel, max_output_tokens=max_output_tokens)
 
     def get_logging_information(self) -> dict:
         """
@@ -1,8 +1,21 @@
+import textwrap
+from functools import cached_property
+
 from langchain.prompts import ChatPromptTemplate
 
 from app.services import MinimalService, ServiceTypes
 
 
+TAGGING_INSTRUCTIONS = textwrap.dedent("""
+    Extract 1 to 4 search tags covering the document's main subjects.
+    - Same language as the document
+    - Lowercase words only, no punctuation
+    - No generic words like "document", "content" or "information"
+    - No repeated or redundant tags
+    Output comma-separated: tag1, tag2, tag3
+""").strip()
+
+
 class Tagger(MinimalService):
     """
     A minimal service for generating tags from text.
@@ -24,7 +37,7 @@ class Tagger(MinimalService):
         """
         return ServiceTypes.TAGGING
 
-    @property
+    @cached_property
     def prompt(self) -> ChatPromptTemplate:
         """
         Defines the prompt template for the tagging task.
@@ -36,37 +49,6 @@ class Tagger(MinimalService):
             content.
         """
         return ChatPromptTemplate.from_messages([
-            (
-                self.message_type,
-                """
-                You are an AI specialized in extracting key topics, tags, and keywords from text.
-                Your task is to generate a concise list of relevant tags that capture the core
-                subjects and themes of the provided document.
-                """
-            ),
-            (
-                self.message_type,
-                """
-                Follow these guidelines when generating the tags:
-                - Ensure the tags are in the same language as the document
-                - Use lowercase words only and avoid punctuation
-                - Include between 1 to 4 tags that cover the main subjects of the document
-                - Avoid generic words like "document," "content," or "information"
-                - Do not repeat tags or include any that are redundant
-                """
-            ),
-            (
-                self.message_type,
-                """
-                You can assume that the generated tags will be used in some sort of search system.
-                """
-            ),
-            (
-                self.message_type,
-                """
-                Output the tags in a comma-separated format, like so:
-                tag1, tag2, tag3, ...
-                """
-            ),
-            ("human", "{text}")
+            (self.message_type, TAGGING_INSTRUCTIONS),
+            ("human", "{text}"),
         ])
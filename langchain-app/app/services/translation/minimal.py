@@ -1,8 +1,20 @@
+import textwrap
+from functools import cached_property
+
 from langchain.prompts import ChatPromptTemplate
 
 from app.services import MinimalService, ServiceTypes
 
 
+TRANSLATION_INSTRUCTIONS = textwrap.dedent("""
+    Translate the text to {target_language}, preserving meaning, context and style.
+    - Vocabulary, syntax and tone natural to the target language
+    - Fluent, not word-for-word
+    - No introductions, explanations or footnotes
+    - Keep the original structure: line breaks, headings, sections, lists
+""").strip()
+
+
 class Translator(MinimalService):
     """
     A minimal service for translating text into a specified target language.
@@ -37,7 +49,7 @@ class Translator(MinimalService):
         """
         return ServiceTypes.TRANSLATION
 
-    @property
+    @cached_property
     def prompt(self) -> ChatPromptTemplate:
         """
         Defines the prompt template for the translation task.
@@ -48,36 +60,9 @@ class Translator(MinimalService):
             The prompt template for translating text into the target language.
         """
         return ChatPromptTemplate.from_messages([
-            (
-                self.message_type,
-                """
-                You are an AI specialized in translating text between multiple languages.
-                Your task is to translate the provided document into the target language
-                accurately, while preserving the meaning, context, and style of the original
-                text.
-                """
-            ),
-            (
-                self.message_type,
-                """
-                Follow these guidelines when translating:
-                - Use vocabulary, syntax, and tone appropriate for the target language
-                - Ensure the translation maintains the original context and intent
-                - Do not add introductions, explanations, or footnotes
-                - Avoid word-for-word translation; prioritize fluidity and coherence
-                - Retain any formatting like lists or bullet points from the original document
-                """
-            ),
-            (
-                self.message_type,
-                """
-                Output the translation in the exact structure of the original document, preserving
-                any line breaks, headings, or sections.
-                """
-            ),
-            (self.message_type, f"Translate the text to {self.target_language}"),
-            ("human", "{text}")
-        ])
+            (self.message_type, TRANSLATION_INSTRUCTIONS),
+            ("human", "{text}"),
+        ]).partial(target_language=self.target_language)
 
     def get_logging_information(self) -> dict:
         """
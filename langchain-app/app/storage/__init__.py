@@ -1,9 +1,11 @@
 from app.storage.base_store_manager import BaseStoreManager
+from app.storage.feedback_buffer import FeedbackBuffer
 from app.storage.file_hasher import FileHasher
 from app.storage.mongodb import MongoDBStoreManager
 
 __all__ = [
     'BaseStoreManager',
+    'FeedbackBuffer',
     'FileHasher',
     'MongoDBStoreManager',
 ]
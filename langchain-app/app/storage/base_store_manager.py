@@ -1,5 +1,6 @@
 from typing import Any
 from abc import ABC, abstractmethod
+from collections.abc import Iterable, Sequence
 
 from app.models import FeedbackForm
 
@@ -13,7 +14,7 @@ class BaseStoreManager(ABC):
     """
 
     @abstractmethod
-    def get_document_by_id(self, _id: str, **kwargs) -> Any:
+    async def get_document_by_id(self, _id: str, **kwargs) -> Any:
         """
         Retrieves a document from the storage system by its unique identifier.
 
@@ -31,6 +32,30 @@ class BaseStoreManager(ABC):
         """
         pass
 
+    @abstractmethod
+    async def get_existing_artefact_hashes(
+        self,
+        _id: str,
+        artefact_types: Iterable[str],
+    ) -> dict[str, str | None]:
+        """
+        Retrieves the parameter hashes of the artefacts already stored for a document.
+
+        Parameters
+        ----------
+        _id : str
+            The unique identifier of the document.
+        artefact_types : Iterable[str]
+            The artefact types (e.g., service types) to look for.
+
+        Returns
+        -------
+        dict[str, str | None]
+            A mapping from each artefact type stored for the document to the hash of the
+            parameters it was generated with, or an empty mapping if the document is not stored.
+        """
+        pass
+
     @abstractmethod
     def get_logging_information(self) -> dict:
         """
@@ -44,7 +69,28 @@ class BaseStoreManager(ABC):
         pass
 
     @abstractmethod
-    def store_service_output(self, _id: str, **kwargs) -> str:
+    async def ensure_document_stored(self, _id: str, document: bytes, **kwargs) -> str:
+        """
+        Stores the original document into the storage system, unless it is already stored.
+
+        Parameters
+        ----------
+        _id : str
+            The unique identifier of the document to store.
+        document : bytes
+            The binary content of the document.
+        **kwargs
+            Additional optional parameters for customization.
+
+        Returns
+        -------
+        str
+            The ID of the stored document.
+        """
+        pass
+
+    @abstractmethod
+    async def store_service_output(self, _id: str, **kwargs) -> str:
         """
         Stores the output of a service into the storage system.
 
@@ -63,7 +109,55 @@ class BaseStoreManager(ABC):
         pass
 
     @abstractmethod
-    def store_service_output_feedback(self, _id: str, form: FeedbackForm, **kwargs) -> None:
+    async def store_service_outputs(self, _id: str, outputs: dict[str, dict], **kwargs) -> str:
+        """
+        Stores the outputs of several services for the same document into the storage system.
+
+        Implementations should persist all outputs in as few round trips as possible.
+
+        Parameters
+        ----------
+        _id : str
+            The unique identifier for the document the outputs belong to.
+        outputs : dict[str, dict]
+            A mapping from artefact names (e.g., service types) to the data to be stored.
+        **kwargs
+            Additional data to be stored, such as metadata or service-specific artefacts.
+
+        Returns
+        -------
+        str
+            The ID of the stored item.
+        """
+        pass
+
+    @abstractmethod
+    async def store_documents_with_outputs(
+        self,
+        documents: Sequence[tuple[str, bytes, dict[str, dict]]],
+        **kwargs,
+    ) -> list[str]:
+        """
+        Stores several documents, along with the outputs of the services executed over them, in
+        a single batch.
+
+        Parameters
+        ----------
+        documents : Sequence[tuple[str, bytes, dict[str, dict]]]
+            The documents to store, as tuples of document ID, binary content of the document and
+            mapping from artefact names to the data to be stored.
+        **kwargs
+            Additional options, such as whether existing artefacts are overwritten.
+
+        Returns
+        -------
+        list[str]
+            The IDs of the stored documents.
+        """
+        pass
+
+    @abstractmethod
+    async def store_service_output_feedback(self, _id: str, form: FeedbackForm, **kwargs) -> None:
         """
         Stores user feedback for a specific service output.
 
@@ -81,3 +175,26 @@ class BaseStoreManager(ABC):
         None
         """
         pass
+
+    @abstractmethod
+    async def store_service_output_feedbacks(
+        self,
+        feedbacks: Sequence[tuple[str, str, FeedbackForm]],
+        **kwargs,
+    ) -> int:
+        """
+        Stores several user feedbacks, possibly for different documents, in a single batch.
+
+        Parameters
+        ----------
+        feedbacks : Sequence[tuple[str, str, FeedbackForm]]
+            The feedbacks to store, as tuples of document ID, service type and feedback form.
+        **kwargs
+            Additional data to be stored alongside the feedbacks.
+
+        Returns
+        -------
+        int
+            The number of feedbacks stored.
+        """
+        pass
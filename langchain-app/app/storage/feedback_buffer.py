@@ -0,0 +1,326 @@
+import asyncio
+import contextlib
+import fcntl
+import os
+from datetime import datetime, timezone
+
+import orjson
+
+from app.logger import global_logger
+from app.models import FeedbackForm
+from app.storage.base_store_manager import BaseStoreManager
+
+
+class FeedbackBuffer:
+    """
+    Buffers user feedbacks in memory and stores them in batches from a background task.
+
+    Feedbacks are flushed to the store manager once `max_batch_size` of them are buffered or
+    `flush_interval` seconds after the first of them was buffered, whichever comes first.
+
+    When a `wal_path` is given, every feedback is appended (and synced to disk) to a write-ahead
+    log before being buffered. The feedbacks put concurrently are written by a background task
+    in a worker thread, with a single sync per group, so the event loop never waits for the
+    disk. The log is truncated only once every feedback written to it has been stored, and the
+    feedbacks still in it when the buffer starts (e.g., after a crash or a storage outage) are
+    buffered again. Feedbacks may therefore be stored more than once, but are not lost. Batches
+    that fail to be stored, or whose storage is interrupted by `stop`, are buffered again.
+
+    The write-ahead log is locked by the buffer while it runs, so each process (e.g., each
+    server worker) must be given its own `wal_path`.
+
+    Attributes
+    ----------
+    store_manager : BaseStoreManager
+        The store manager the buffered feedbacks are stored with.
+    max_batch_size : int
+        The maximum number of feedbacks stored in a single batch.
+    flush_interval : float
+        The maximum time, in seconds, a feedback waits in the buffer before being stored.
+    wal_path : str or None
+        The path of the write-ahead log, or None if feedbacks are only buffered in memory. The
+        path must not be shared with other processes.
+    """
+
+    def __init__(
+        self,
+        store_manager: BaseStoreManager,
+        max_batch_size: int = 500,
+        flush_interval: float = 0.5,
+        wal_path: str | None = None,
+    ) -> None:
+        """
+        Initializes the `FeedbackBuffer` with its store manager and batching settings.
+
+        Parameters
+        ----------
+        store_manager : BaseStoreManager
+            The store manager the buffered feedbacks are stored with.
+        max_batch_size : int, optional
+            The maximum number of feedbacks stored in a single batch (default is 500).
+        flush_interval : float, optional
+            The maximum time, in seconds, a feedback waits in the buffer (default is 0.5).
+        wal_path : str or None, optional
+            The path of the write-ahead log (default is None, for no write-ahead log).
+        """
+        self.store_manager = store_manager
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.wal_path = wal_path
+        self.logger = global_logger.bind(**store_manager.get_logging_information())
+        self._queue = asyncio.Queue()
+        self._task = None
+        self._wal = None
+        self._wal_task = None
+        # feedbacks waiting to be written to the write-ahead log, with the futures their callers
+        # wait on until they are synced to disk
+        self._wal_pending = []
+        self._wal_pending_event = asyncio.Event()
+        # held while writing to or truncating the write-ahead log
+        self._wal_lock = asyncio.Lock()
+        self._stopping = False
+
+    async def put(self, _id: str, service_type: str, form: FeedbackForm) -> None:
+        """
+        Adds a feedback to the buffer, to be stored with the next batch.
+
+        The feedback is stamped with its creation date (unless it already has one) before being
+        written to the write-ahead log, so it is not changed by the time the batch is stored or
+        the log is replayed. With a write-ahead log, this returns once the feedback is synced to
+        disk, so the feedback is only acknowledged once it would survive a crash of the host.
+
+        Parameters
+        ----------
+        _id : str
+            The unique identifier of the document.
+        service_type : str
+            The type of service (e.g., summarization, translation).
+        form : FeedbackForm
+            The feedback form containing user feedback.
+        """
+        if form.created_at is None:
+            form = form.model_copy(update={"created_at": datetime.now(timezone.utc)})
+        if self._wal is None:
+            self._queue.put_nowait((_id, service_type, form))
+            return
+
+        synced = asyncio.get_running_loop().create_future()
+        self._wal_pending.append(((_id, service_type, form), synced))
+        self._wal_pending_event.set()
+        await synced
+
+    def start(self) -> None:
+        """
+        Starts the background task that stores the buffered feedbacks, buffering again the
+        feedbacks left in the write-ahead log.
+
+        Raises
+        ------
+        RuntimeError
+            If the write-ahead log is locked by another process.
+        """
+        if self._task is not None:
+            return
+
+        self._stopping = False
+        if self.wal_path is not None:
+            self._wal = open(self.wal_path, 'ab')
+            try:
+                fcntl.flock(self._wal.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                self._wal.close()
+                self._wal = None
+                raise RuntimeError(
+                    f"Feedback write-ahead log '{self.wal_path}' is used by another process, "
+                    "each process must be given its own write-ahead log"
+                )
+            for feedback in self._read_wal():
+                self._queue.put_nowait(feedback)
+            if self._wal.tell():
+                # terminates a partially written last line, which is skipped when replaying
+                self._wal.write(b"\n")
+            self.logger.info("Replayed feedback write-ahead log", replayed=self._queue.qsize())
+            self._wal_task = asyncio.create_task(self._log_ahead())
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stops the background tasks and stores the feedbacks still in the buffer. Feedbacks that
+        fail to be stored are kept in the write-ahead log, to be buffered again on next start.
+        """
+        if self._wal_task is not None:
+            # the feedbacks already put are written to the write-ahead log and buffered first
+            self._stopping = True
+            self._wal_pending_event.set()
+            await self._wal_task
+            self._wal_task = None
+
+        if self._task is not None:
+            # a batch being stored when the task is cancelled is buffered again, so every
+            # feedback not known to be stored is still in the buffer
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+        stored = True
+        while not self._queue.empty():
+            stored &= await self._store(self._get_buffered(self.max_batch_size))
+        if stored:
+            await self._truncate_wal()
+
+        if self._wal is not None:
+            self._wal.close()
+            self._wal = None
+
+    async def _run(self) -> None:
+        """
+        Waits for feedbacks to be buffered and stores them in batches, until cancelled.
+        """
+        while True:
+            batch = [await self._queue.get()]
+            deadline = asyncio.get_running_loop().time() + self.flush_interval
+            try:
+                with contextlib.suppress(TimeoutError):
+                    async with asyncio.timeout_at(deadline):
+                        while len(batch) < self.max_batch_size:
+                            batch.append(await self._queue.get())
+                stored = await self._store_or_retry(batch)
+            except asyncio.CancelledError:
+                # the batch may not have been stored yet, so it is buffered again to be stored
+                # by `stop` (possibly a second time)
+                self._requeue(batch)
+                raise
+            if not stored:
+                # waits before retrying, e.g. while the database is unavailable
+                await asyncio.sleep(self.flush_interval)
+
+    async def _log_ahead(self) -> None:
+        """
+        Writes the feedbacks put since the previous write to the write-ahead log and buffers
+        them once they are synced to disk, until stopped and every feedback put is written.
+        """
+        while True:
+            if not self._wal_pending:
+                if self._stopping:
+                    return
+                self._wal_pending_event.clear()
+                await self._wal_pending_event.wait()
+                continue
+
+            # the feedbacks put while the previous group was synced are written as one group
+            pending, self._wal_pending = self._wal_pending, []
+            records = b"".join(
+                orjson.dumps({
+                    "_id": _id,
+                    "service_type": service_type,
+                    "form": form.model_dump(),
+                }) + b"\n"
+                for (_id, service_type, form), _ in pending
+            )
+            async with self._wal_lock:
+                try:
+                    await asyncio.to_thread(self._append_to_wal, records)
+                except Exception as error:
+                    self.logger.exception("Failed to write feedback write-ahead log")
+                    for _, synced in pending:
+                        if not synced.done():
+                            synced.set_exception(error)
+                    continue
+
+                for feedback, synced in pending:
+                    self._queue.put_nowait(feedback)
+                    if not synced.done():
+                        synced.set_result(None)
+
+    def _append_to_wal(self, records: bytes) -> None:
+        """
+        Appends records to the write-ahead log and syncs them to disk, in a worker thread.
+        """
+        self._wal.write(records)
+        self._wal.flush()
+        os.fsync(self._wal.fileno())
+
+    def _read_wal(self) -> list[tuple[str, str, FeedbackForm]]:
+        """
+        Reads the feedbacks left in the write-ahead log, ignoring a partially written last line.
+        """
+        if not os.path.exists(self.wal_path):
+            return []
+
+        feedbacks = []
+        with open(self.wal_path, 'rb') as wal:
+            for line in wal:
+                try:
+                    record = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    continue
+                feedbacks.append((
+                    record["_id"],
+                    record["service_type"],
+                    FeedbackForm.model_validate(record["form"]),
+                ))
+        return feedbacks
+
+    def _get_buffered(self, max_items: int) -> list[tuple[str, str, FeedbackForm]]:
+        """
+        Removes up to `max_items` feedbacks from the buffer without waiting.
+        """
+        items = []
+        while len(items) < max_items and not self._queue.empty():
+            items.append(self._queue.get_nowait())
+        return items
+
+    def _requeue(self, batch: list[tuple[str, str, FeedbackForm]]) -> None:
+        """
+        Buffers again the feedbacks of a batch that was not stored.
+        """
+        for feedback in batch:
+            self._queue.put_nowait(feedback)
+
+    async def _store_or_retry(self, batch: list[tuple[str, str, FeedbackForm]]) -> bool:
+        """
+        Stores a batch of feedbacks, buffering them again if they fail to be stored, and
+        truncates the write-ahead log once every feedback written to it has been stored.
+
+        Returns
+        -------
+        bool
+            Whether the batch was stored.
+        """
+        if not await self._store(batch):
+            self._requeue(batch)
+            return False
+
+        await self._truncate_wal()
+        return True
+
+    async def _store(self, batch: list[tuple[str, str, FeedbackForm]]) -> bool:
+        """
+        Stores a batch of feedbacks, logging (instead of raising) storage errors so that the
+        background task keeps running.
+
+        Returns
+        -------
+        bool
+            Whether the batch was stored.
+        """
+        try:
+            stored = await self.store_manager.store_service_output_feedbacks(feedbacks=batch)
+        except Exception:
+            self.logger.exception("Failed to store feedback batch", batch_size=len(batch))
+            return False
+
+        self.logger.info("Stored feedback batch", batch_size=len(batch), stored=stored)
+        return True
+
+    async def _truncate_wal(self) -> None:
+        """
+        Truncates the write-ahead log, unless some feedbacks written to it are still buffered
+        (e.g., written while the last batch was being stored).
+        """
+        if self._wal is None:
+            return
+        async with self._wal_lock:
+            if self._queue.empty():
+                self._wal.truncate(0)
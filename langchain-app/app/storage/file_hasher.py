@@ -1,4 +1,28 @@
 import hashlib
+import os
+from collections.abc import Iterable
+from types import MappingProxyType
+from typing import BinaryIO
+
+
+def create_blake3_hash(data: bytes | memoryview = b''):
+    """
+    Creates a BLAKE3 hash object. The optional `blake3` package is only imported when the
+    algorithm is used, so it is not required by the default SHA-256 hashes.
+    """
+    from blake3 import blake3
+
+    return blake3(data)
+
+
+def create_xxh3_hash(data: bytes | memoryview = b''):
+    """
+    Creates an XXH3 (128 bits) hash object. The optional `xxhash` package is only imported when
+    the algorithm is used, so it is not required by the default SHA-256 hashes.
+    """
+    import xxhash
+
+    return xxhash.xxh3_128(data)
 
 
 class FileHasher:
@@ -6,11 +30,33 @@ class FileHasher:
     A utility class for generating unique hashes for documents based on their content.
 
     The `FileHasher` processes specific parts of the document (the first and last N bytes)
-    to create a SHA-256 hash. This allows documents to be identified by their content
-    instead of their file name or other metadata.
+    to create a hash (SHA-256 by default). This allows documents to be identified by their
+    content instead of their file name or other metadata.
+
+    Attributes
+    ----------
+    hash_constructors : dict
+        A dictionary mapping hash algorithm names to the constructors of their hash objects.
+        `hashlib.sha256` is backed by OpenSSL, which uses the SHA extensions of the CPU when
+        they are available. BLAKE3 is faster for large parts, and XXH3 (128 bits) is faster
+        still, but is not a cryptographic hash, which is acceptable as long as the hashes are
+        only used to identify documents. Both produce different hashes, so documents already
+        stored with SHA-256 hashes are not found with them. BLAKE3 and XXH3 require the
+        `blake3` and `xxhash` packages, which are not installed by default.
     """
 
-    def __init__(self, first_n_bytes: int = 512, last_n_bytes: int = 512) -> None:
+    hash_constructors = MappingProxyType({
+        'sha256': hashlib.sha256,
+        'blake3': create_blake3_hash,
+        'xxh3': create_xxh3_hash,
+    })
+
+    def __init__(
+        self,
+        first_n_bytes: int = 512,
+        last_n_bytes: int = 512,
+        algorithm: str = 'sha256',
+    ) -> None:
         """
         Initializes the `FileHasher` with configuration for the number of bytes to hash.
 
@@ -20,17 +66,31 @@ class FileHasher:
             The number of bytes to read from the start of the file for hashing (default is 512).
         last_n_bytes : int, optional
             The number of bytes to read from the end of the file for hashing (default is 512).
+        algorithm : str, optional
+            The hash algorithm, one of `hash_constructors` (default is 'sha256').
+
+        Raises
+        ------
+        ValueError
+            If the specified hash algorithm is not valid.
         """
+        if algorithm not in self.hash_constructors:
+            raise ValueError(
+                f"Invalid hash algorithm '{algorithm}'. "
+                f"Valid hash algorithms are: {list(self.hash_constructors.keys())}"
+            )
         self.first_n_bytes = first_n_bytes
         self.last_n_bytes = last_n_bytes
+        self.algorithm = algorithm
+        self.hash_constructor = self.hash_constructors[algorithm]
 
     def hash(self, file_bytes: bytes) -> str:
         """
-        Generates a SHA-256 hash for the given file content.
+        Generates a hash for the given file content.
 
         The hash is based on the concatenation of the first `first_n_bytes` and the last
-        `last_n_bytes` of the file content. If the file is smaller than `last_n_bytes`,
-        all available bytes are used.
+        `last_n_bytes` of the file content. Files no larger than the two parts together are
+        hashed as a whole, so overlapping bytes are not hashed twice.
 
         Parameters
         ----------
@@ -40,26 +100,139 @@ class FileHasher:
         Returns
         -------
         str
-            The hexadecimal representation of the SHA-256 hash.
+            The hexadecimal representation of the hash.
 
         Examples
         --------
         >>> file_hasher = FileHasher(first_n_bytes=256, last_n_bytes=256)
         >>> file_content = b"Example file content for hashing."
-        >>> file_hash = file_hasher.hash(file_content)
-        >>> print(file_hash)
-        'd2d2f6c90f3bd8bce58eb2a6c6a7f9f650a7c9ec16d46a20a0b5b9c9baf3bd8d'
+        >>> file_hasher.hash(file_content)
+        '94d9327551a799911e8dc06b22f47141c325de4b93b515cc3aae4f17a9a5cdb9'
+        """
+        # slices of a memoryview are views of the file content instead of copies
+        file_view = memoryview(file_bytes)
+        if len(file_view) <= self.first_n_bytes + self.last_n_bytes:
+            return self.hash_constructor(file_view).hexdigest()
+
+        first_part = file_view[:self.first_n_bytes]
+
+        last_part = file_view[-self.last_n_bytes:]
+
+        return self._digest(first_part=first_part, last_part=last_part)
+
+    def legacy_hash(self, file_bytes: bytes) -> str:
         """
-        first_part = file_bytes[:self.first_n_bytes]
+        Generates the hash that identified the given file content before files no larger than
+        the two parts together were hashed as a whole.
 
-        last_part = (
-            file_bytes[-self.last_n_bytes:]
-            if len(file_bytes) >= self.last_n_bytes else file_bytes
+        For such files, the hash is computed over both parts even though they overlap. Larger
+        files get the same hash as with `hash`. Only used to migrate the IDs of the documents
+        stored before the change.
+
+        Parameters
+        ----------
+        file_bytes : bytes
+            The binary content of the file to be hashed.
+
+        Returns
+        -------
+        str
+            The hexadecimal representation of the hash.
+        """
+        file_view = memoryview(file_bytes)
+        return self._digest(
+            first_part=file_view[:self.first_n_bytes],
+            last_part=file_view[-self.last_n_bytes:],
         )
 
-        combined_bytes = first_part + last_part
+    def hash_many(self, files_bytes: Iterable[bytes]) -> list[str]:
+        """
+        Generates hashes for the content of several files, e.g. in ingestion pipelines.
+
+        Parameters
+        ----------
+        files_bytes : Iterable[bytes]
+            The binary content of each file to be hashed.
+
+        Returns
+        -------
+        list[str]
+            The hexadecimal representation of the hash of each file, in the same order
+            as `files_bytes`.
+        """
+        return [self.hash(file_bytes) for file_bytes in files_bytes]
+
+    def hash_path(self, file_path: str) -> str:
+        """
+        Generates a hash for the file located at `file_path`.
+
+        Only the regions used by `hash` are read from disk, so the memory required to hash
+        the file does not depend on its size. The resulting hash is the same as the one
+        produced by `hash` for the full content of the file.
+
+        Parameters
+        ----------
+        file_path : str
+            The path to the file to be hashed.
+
+        Returns
+        -------
+        str
+            The hexadecimal representation of the hash.
+        """
+        with open(file_path, 'rb') as file:
+            return self.hash_stream(file=file, size=os.fstat(file.fileno()).st_size)
+
+    def hash_stream(self, file: BinaryIO, size: int) -> str:
+        """
+        Generates a hash for the content of a seekable binary file object, e.g. an upload
+        spooled to a temporary file.
+
+        Only the regions used by `hash` are read, starting from the beginning of the file
+        regardless of its current position. The resulting hash is the same as the one produced
+        by `hash` for the full content of the file.
+
+        Parameters
+        ----------
+        file : BinaryIO
+            The seekable binary file object to be hashed.
+        size : int
+            The size of the content of the file, in bytes.
 
-        sha256 = hashlib.sha256()
-        sha256.update(combined_bytes)
+        Returns
+        -------
+        str
+            The hexadecimal representation of the hash.
+        """
+        file.seek(0)
+        if size <= self.first_n_bytes + self.last_n_bytes:
+            return self.hash_constructor(file.read(size)).hexdigest()
+
+        first_part = file.read(self.first_n_bytes)
+        file.seek(size - self.last_n_bytes)
+        last_part = file.read(self.last_n_bytes)
+
+        return self._digest(first_part=first_part, last_part=last_part)
+
+    def _digest(self, first_part: bytes | memoryview, last_part: bytes | memoryview) -> str:
+        """
+        Computes the hash of the concatenation of the two parts of the file.
+
+        The parts are fed to the hash one after the other, so they are not concatenated.
+
+        Parameters
+        ----------
+        first_part : bytes or memoryview
+            The bytes read from the start of the file.
+        last_part : bytes or memoryview
+            The bytes read from the end of the file.
+
+        Returns
+        -------
+        str
+            The hexadecimal representation of the hash.
+        """
+        file_hash = self.hash_constructor(first_part)
+        file_hash.update(last_part)
 
-        return sha256.hexdigest()
+        return file_hash.hexdigest()
@@ -0,0 +1,27 @@
+"""
+One-off migrations of the stored documents, run from the application container with
+`python -m app.storage.migrations`.
+"""
+import asyncio
+import os
+
+from app.document_processor import DocumentProcessor
+from app.logger import global_logger
+from app.storage.mongodb import MongoDBStoreManager
+
+
+async def migrate() -> None:
+    """
+    Moves the documents of at most `first_n_bytes + last_n_bytes` (1 KiB by default) stored
+    under the IDs they had before such files were hashed as a whole.
+    """
+    store_manager = MongoDBStoreManager(
+        user=os.environ['MONGO_INITDB_ROOT_USERNAME'],
+        password=os.environ['MONGO_INITDB_ROOT_PASSWORD'],
+    )
+    migrated = await store_manager.migrate_small_document_ids(hasher=DocumentProcessor.hasher)
+    global_logger.info("Migrated small document IDs", migrated=migrated)
+
+
+if __name__ == '__main__':
+    asyncio.run(migrate())
@@ -0,0 +1,99 @@
+import asyncio
+
+from langchain_core.documents.base import Document
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages.ai import AIMessage, AIMessageChunk
+
+from app.models import DocumentInfo
+from app.services.summarization.dynamic_prompts import (
+    UNKNOWN_DOCUMENT_INFO,
+    DynamicPromptSummarizer,
+)
+
+
+class FakeExtractionChain:
+    """Extraction chain answering after `delay` seconds, and recording whether it was cancelled."""
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.cancelled = False
+
+    async def ainvoke(self, inputs: dict) -> DocumentInfo:
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return DocumentInfo(
+            text_type='report',
+            media_type='text file',
+            document_domain='financial',
+            audience='analysts',
+            audience_expertise='expert',
+            key_points='revenue',
+        )
+
+
+class FakeSummarizationChain:
+    """Summarization chain recording the inputs it was called with."""
+
+    def __init__(self) -> None:
+        self.inputs = []
+
+    async def ainvoke(self, inputs: dict) -> AIMessage:
+        self.inputs.append(inputs)
+        return AIMessage(content='summary')
+
+    async def astream(self, inputs: dict):
+        self.inputs.append(inputs)
+        for content in ('sum', 'mary'):
+            yield AIMessageChunk(content=content)
+
+
+def build_summarizer(extraction_delay: float) -> DynamicPromptSummarizer:
+    summarizer = DynamicPromptSummarizer(
+        chatmodel=FakeListChatModel(responses=['summary']),
+        extraction_chatmodel=FakeListChatModel(responses=['{}']),
+        extraction_timeout=0.1,
+    )
+    summarizer.extraction_chain = FakeExtractionChain(delay=extraction_delay)
+    summarizer.summarization_chain = FakeSummarizationChain()
+    return summarizer
+
+
+def get_document_info(inputs: dict) -> dict:
+    return {field: inputs[field] for field in DocumentInfo.model_fields}
+
+
+def test_summary_uses_document_info_extracted_in_time():
+    summarizer = build_summarizer(extraction_delay=0)
+
+    summary = asyncio.run(summarizer.summarize(content=[Document(page_content='text')]))
+
+    assert summary.content == 'summary'
+    [inputs] = summarizer.summarization_chain.inputs
+    assert get_document_info(inputs)['document_domain'] == 'financial'
+
+
+def test_summary_without_document_info_when_extraction_is_late():
+    summarizer = build_summarizer(extraction_delay=60)
+
+    summary = asyncio.run(summarizer.summarize(content=[Document(page_content='text')]))
+
+    assert summary.content == 'summary'
+    [inputs] = summarizer.summarization_chain.inputs
+    assert get_document_info(inputs) == dict(UNKNOWN_DOCUMENT_INFO)
+    assert summarizer.extraction_chain.cancelled
+
+
+def test_streamed_summary_uses_the_same_document_info():
+    summarizer = build_summarizer(extraction_delay=0)
+
+    async def collect() -> list[AIMessageChunk]:
+        return [chunk async for chunk in summarizer.stream(content=[Document(page_content='text')])]
+
+    chunks = asyncio.run(collect())
+
+    assert "".join(chunk.content for chunk in chunks) == 'summary'
+    [inputs] = summarizer.summarization_chain.inputs
+    assert get_document_info(inputs)['document_domain'] == 'financial'
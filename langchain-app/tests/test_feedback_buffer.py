@@ -0,0 +1,73 @@
+import asyncio
+
+from app.models import FeedbackForm
+from app.storage import FeedbackBuffer
+
+
+class SlowStoreManager:
+    """
+    Store manager whose first batch is stored slowly enough to be interrupted by `stop`, and whose
+    next batches are stored (or fail to be stored) immediately.
+    """
+
+    def __init__(self, fail_after_first: bool = False) -> None:
+        self.fail_after_first = fail_after_first
+        self.first_batch_started = asyncio.Event()
+        self.calls = 0
+        self.stored = []
+
+    def get_logging_information(self) -> dict:
+        return {}
+
+    async def store_service_output_feedbacks(self, feedbacks) -> int:
+        self.calls += 1
+        if self.calls == 1:
+            self.first_batch_started.set()
+            await asyncio.sleep(3600)
+        elif self.fail_after_first:
+            raise ConnectionError("database unavailable")
+        self.stored.extend(feedbacks)
+        return len(feedbacks)
+
+
+async def put_and_stop_while_storing(buffer: FeedbackBuffer, store_manager: SlowStoreManager):
+    buffer.start()
+    await buffer.put(_id='document', service_type='summary', form=FeedbackForm(user='user'))
+    await store_manager.first_batch_started.wait()
+    await buffer.stop()
+
+
+def test_batch_interrupted_by_stop_is_stored():
+    store_manager = SlowStoreManager()
+    buffer = FeedbackBuffer(store_manager=store_manager, flush_interval=0.01)
+
+    asyncio.run(put_and_stop_while_storing(buffer=buffer, store_manager=store_manager))
+
+    assert [(_id, service_type) for _id, service_type, _ in store_manager.stored] == [
+        ('document', 'summary'),
+    ]
+
+
+def test_batch_interrupted_by_stop_is_stored_and_removed_from_wal(tmp_path):
+    wal_path = tmp_path / 'feedback.wal'
+    store_manager = SlowStoreManager()
+    buffer = FeedbackBuffer(store_manager=store_manager, flush_interval=0.01, wal_path=wal_path)
+
+    asyncio.run(put_and_stop_while_storing(buffer=buffer, store_manager=store_manager))
+
+    assert len(store_manager.stored) == 1
+    assert wal_path.read_bytes() == b""
+
+
+def test_batch_interrupted_by_stop_is_kept_in_wal_when_not_stored(tmp_path):
+    wal_path = tmp_path / 'feedback.wal'
+    store_manager = SlowStoreManager(fail_after_first=True)
+    buffer = FeedbackBuffer(store_manager=store_manager, flush_interval=0.01, wal_path=wal_path)
+
+    asyncio.run(put_and_stop_while_storing(buffer=buffer, store_manager=store_manager))
+
+    assert store_manager.stored == []
+    replayed = FeedbackBuffer(store_manager=store_manager, wal_path=wal_path)._read_wal()
+    assert [(_id, service_type) for _id, service_type, _ in replayed] == [
+        ('document', 'summary'),
+    ]